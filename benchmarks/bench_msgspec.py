@@ -0,0 +1,74 @@
+"""
+Сравнение клиентских путей разбора ответа на одной и той же спецификации:
+pydantic (response.json() + Model(**item), TypeAdapter.validate_json)
+и msgspec.Struct (--model-type msgspec: декодирование прямо из bytes).
+Модели обоих видов генерируются ModelGenerator во временный каталог,
+тело ответа - список объектов из SchemaDataGenerator.
+
+    python benchmarks/bench_msgspec.py --swagger swagger.json --schema Item [--count 10000] [--repeat 5]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import timeit
+from typing import List
+
+from pydantic import TypeAdapter
+
+from my_codegen.codegen.model_generator import ModelGenerator
+from my_codegen.http_clients import msgspec_codec
+from my_codegen.pydantic_utils.context import GeneratorContext
+from my_codegen.pydantic_utils.schema_generator import SchemaDataGenerator
+
+
+def load_models(swagger_path: str, directory: str, model_type: str):
+    models_file = os.path.join(directory, f"models_{model_type}")
+    generator = ModelGenerator(swagger_path, models_file, model_type=model_type)
+    generator.generate_models()
+    generator.fix_models_inheritance()
+    name = f"bench_models_{model_type}"
+    spec = importlib.util.spec_from_file_location(name, models_file + ".py")
+    module = importlib.util.module_from_spec(spec)
+    # datamodel-codegen пишет "from __future__ import annotations" - модуль должен быть в sys.modules
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--swagger", required=True)
+    parser.add_argument("--schema", required=True, help="Имя схемы из components/schemas")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = SchemaDataGenerator.from_file(args.swagger).batch(args.schema, args.count, GeneratorContext(seed=1))
+    body = json.dumps(data).encode()
+    print(f"{args.schema}: {args.count} objects, {len(body) / 1024:.0f} KiB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        pydantic_model = getattr(load_models(args.swagger, directory, "pydantic"), args.schema)
+        struct_model = getattr(load_models(args.swagger, directory, "msgspec"), args.schema)
+
+    adapter = TypeAdapter(List[pydantic_model])
+    instances = [pydantic_model(**item) for item in data]
+    structs = msgspec_codec.decode(List[struct_model], body)
+
+    cases = {
+        "pydantic json.loads + Model(**)": lambda: [pydantic_model(**item) for item in json.loads(body)],
+        "pydantic validate_json": lambda: adapter.validate_json(body),
+        "msgspec decode": lambda: msgspec_codec.decode(List[struct_model], body),
+        "pydantic model_dump + json.dumps": lambda: json.dumps([i.model_dump(mode="json") for i in instances]),
+        "msgspec encode": lambda: msgspec_codec.encode(structs),
+    }
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{name:34} {best * 1e3:8.1f} ms  {best / args.count * 1e6:6.2f} us/object")
+
+
+if __name__ == "__main__":
+    main()
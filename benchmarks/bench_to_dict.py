@@ -0,0 +1,102 @@
+"""
+Сравнение GenerateData.to_dict/to_json_bytes (сериализатор pydantic-core)
+с прежним рекурсивным обходом __dict__ + json.dumps(cls=UUIDEncoder).
+
+    python benchmarks/bench_to_dict.py [--count 2000] [--repeat 5]
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pydantic import RootModel
+
+from my_codegen.http_clients.api_client import UUIDEncoder
+from my_codegen.pydantic_utils.context import GeneratorContext
+from my_codegen.pydantic_utils.data_generator_pydantic import GenerateData
+from my_codegen.pydantic_utils.pydantic_config import BaseConfigModel
+
+
+class Status(Enum):
+    new = "new"
+    sold = "sold"
+
+
+class Tags(RootModel[List[str]]):
+    pass
+
+
+class Leaf(BaseConfigModel):
+    id: UUID
+    name: str
+    price: float
+    status: Status
+    created_at: datetime
+    tags: Tags
+
+
+class Branch(BaseConfigModel):
+    leaves: List[Leaf]
+    meta: Dict[str, int]
+    main: Optional[Leaf] = None
+
+
+class Tree(BaseConfigModel):
+    branches: List[Branch]
+    root: Leaf
+    title: str
+
+
+def legacy_to_dict(instance):
+    """Прежняя реализация GenerateData._convert_to_dict"""
+    if isinstance(instance, BaseConfigModel):
+        result = {}
+        for k, v in instance.__dict__.items():
+            if isinstance(v, BaseConfigModel):
+                result[k] = legacy_to_dict(v)
+            elif isinstance(v, list):
+                result[k] = [legacy_to_dict(i) for i in v]
+            elif isinstance(v, dict):
+                result[k] = {kk: legacy_to_dict(vv) for kk, vv in v.items()}
+            else:
+                result[k] = v
+        return result
+    return instance
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    context = GeneratorContext(seed=1)
+    generators = [
+        GenerateData(Tree, context=context).fill_all_fields()
+        for _ in range(args.count)
+    ]
+    instances = [generator.build() for generator in generators]
+    serializer = Tree.__pydantic_serializer__
+
+    cases = {
+        "legacy recursion": lambda: [legacy_to_dict(i) for i in instances],
+        "legacy + json.dumps": lambda: [json.dumps(legacy_to_dict(i), cls=UUIDEncoder) for i in instances],
+        "to_dict (pydantic-core)": lambda: [
+            serializer.to_python(i, mode="json", warnings=False) for i in instances
+        ],
+        "to_json_bytes (pydantic-core)": lambda: [serializer.to_json(i, warnings=False) for i in instances],
+    }
+    for name, case in cases.items():
+        try:
+            best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        except TypeError as e:
+            print(f"{name:32} failed: {e}")
+            continue
+        print(f"{name:32} {best / args.count * 1e6:8.1f} us/object")
+
+
+if __name__ == "__main__":
+    main()
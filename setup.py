@@ -31,7 +31,9 @@ setuptools.setup(
         "isort==5.13.2",
         "Jinja2==3.1.5",
         "MarkupSafe==3.0.2",
+        "msgspec==0.19.0",
         "mypy-extensions==1.0.0",
+        "numpy==2.2.1",
         "packaging==24.2",
         "pathspec==0.12.1",
         "platformdirs==4.3.6",
@@ -55,6 +57,9 @@ setuptools.setup(
         "console_scripts": [
             "my-api-client=my_codegen.main:main",
         ],
+        "pytest11": [
+            "my_api_client=my_codegen.pytest_plugin",
+        ],
     },
     python_requires=">=3.7",
     classifiers=[
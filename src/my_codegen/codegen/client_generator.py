@@ -1,16 +1,30 @@
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 from jinja2 import Environment, PackageLoader
 from my_codegen.codegen.data_models import Endpoint, SubPath
 
 import re
 
+# Имена из typing, которые может использовать сгенерированный клиент
+TYPING_NAMES = ("Any", "Dict", "Iterator", "List", "Optional")
+
 
 class ClientGenerator:
-    def __init__(self, endpoints: List[Endpoint], imports: List[str], template_name: str):
+    def __init__(
+            self,
+            endpoints: List[Endpoint],
+            imports: List[str],
+            template_name: str,
+            model_type: str = "pydantic",
+            imports_by_tag: Optional[Dict[str, List[str]]] = None,
+    ):
         self.endpoints = endpoints
         self.imports = imports
+        # Результат SwaggerProcessor.extract_imports_by_tag(): клиент тега импортирует только свои модели
+        self.imports_by_tag = imports_by_tag
         self.template_name = template_name
+        # "pydantic" или "msgspec" - как клиенты собирают модели из ответа
+        self.model_type = model_type
 
         self.env = Environment(
             loader=PackageLoader("my_codegen", "templates"),
@@ -38,9 +52,11 @@ class ClientGenerator:
                 base_path=base_path,
                 sub_paths=sub_paths,
                 methods=eps,
-                imports=self.imports,
+                typing_imports=self._typing_imports(eps),
+                imports=self.imports if self.imports_by_tag is None else self.imports_by_tag.get(tag, []),
                 models_import_path=f"http_clients.{service_name}.models",
                 service_name=f"/{service_name}",
+                model_type=self.model_type,
                 is_primitive_type=self.is_primitive_type,
                 get_inner_type=self.get_inner_type
             )
@@ -109,6 +125,24 @@ class ClientGenerator:
             return first_segment
         return "sub_path"
 
+    @staticmethod
+    def _typing_imports(eps: List[Endpoint]) -> List[str]:
+        """Имена typing, которые встречаются в сигнатурах методов клиента (повторяет аннотации шаблона)"""
+        annotations = []
+        for ep in eps:
+            annotations += ep.method_parameters
+            annotations.append(ep.return_type)
+            if ep.http_method == "GET":
+                annotations.append("Optional[Dict[str, Any]]")
+                if ep.return_type.startswith("List["):
+                    annotations.append("Iterator")
+            else:
+                annotations.append(ep.payload_type or "Optional[Any]")
+            if ep.pagination:
+                annotations += ["Optional[Dict[str, Any]]", "Iterator", ep.pagination.item_type]
+        used = set(re.findall(r"\b\w+\b", " ".join(annotations)))
+        return [name for name in TYPING_NAMES if name in used]
+
     @staticmethod
     def is_primitive_type(type_str: str) -> bool:
         """Проверяет, является ли тип примитивным"""
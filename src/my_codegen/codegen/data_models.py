@@ -9,6 +9,20 @@ class Parameter:
     required: bool = False
 
 
+@dataclass
+class Pagination:
+    """Схема постраничной выдачи эндпоинта, найденная SwaggerProcessor"""
+    style: str  # "page" | "offset" | "cursor"
+    item_type: str
+    page_param: str  # page / offset / cursor в query
+    size_param: Optional[str] = None  # size / limit в query
+    items_field: Optional[str] = None  # None - ответ сам является списком
+    total_field: Optional[str] = None
+    total_pages_field: Optional[str] = None
+    next_cursor_field: Optional[str] = None
+    first_page: int = 1
+
+
 @dataclass
 class Endpoint:
     tag: str
@@ -21,6 +35,7 @@ class Endpoint:
     expected_status: str = "OK"
     return_type: str = "Any"
     description: str = ""
+    pagination: Optional[Pagination] = None
 
     @property
     def sanitized_path(self) -> str:
@@ -1,16 +1,27 @@
 import os
 import re
+from typing import Dict, Optional
+
 from my_codegen.utils.shell import run_command
 
 
 class ModelGenerator:
-    def __init__(self, swagger_path: str, models_file: str = 'models'):
+    OUTPUT_MODEL_TYPES = {
+        "pydantic": "pydantic_v2.BaseModel",
+        "msgspec": "msgspec.Struct",
+    }
+
+    def __init__(self, swagger_path: str, models_file: str = 'models', model_type: str = 'pydantic'):
+        if model_type not in self.OUTPUT_MODEL_TYPES:
+            raise ValueError(f"Unknown model type: {model_type}")
         self.swagger_path = swagger_path
         self.models_file = models_file
+        self.model_type = model_type
 
     def generate_models(self) -> None:
         """
-        Запускает datamodel-codegen, чтобы сгенерировать Pydantic-модели на основе Swagger.
+        Запускает datamodel-codegen, чтобы сгенерировать модели на основе Swagger
+        (Pydantic или msgspec.Struct, см. model_type).
         Результат - файл {self.models_file}.py.
         """
         model_cmd = (
@@ -22,20 +33,24 @@ class ModelGenerator:
             "--use-schema-description "
             "--collapse-root-models "
             "--target-python-version 3.9 "
-            "--output-model-type pydantic_v2.BaseModel "
+            f"--output-model-type {self.OUTPUT_MODEL_TYPES[self.model_type]} "
             "--use-annotated"
 
         )
         run_command(model_cmd)
 
-    def fix_models_inheritance(self) -> None:
+    def fix_models_inheritance(self, model_usage: Optional[Dict[str, str]] = None) -> None:
         """
         Заменяет наследование BaseModel -> BaseConfigModel в итоговом файле моделей,
         а также правит импорт, убирая 'BaseModel' из 'from pydantic import ...'
         и добавляя при необходимости 'from http_clients.pydantic_config import BaseConfigModel'.
+
+        model_usage - результат SwaggerProcessor.analyze_model_usage(): модели,
+        которые встречаются только в ответах ("output"), наследуются от BaseResponseModel.
         """
         models_path = self.models_file + ".py"
-        if not os.path.exists(models_path):
+        # У msgspec.Struct нет BaseModel - заменять нечего
+        if self.model_type != 'pydantic' or not os.path.exists(models_path):
             return
 
         with open(models_path, 'r', encoding='utf-8') as f:
@@ -46,6 +61,9 @@ class ModelGenerator:
 
         # Регулярка, ловящая слово BaseModel как отдельное
         base_model_pattern = re.compile(r"\bBaseModel\b")
+        class_pattern = re.compile(r"^class (\w+)\(BaseModel\):")
+        model_usage = model_usage or {}
+        uses_response_base = False
 
         last_import_index = -1
 
@@ -55,7 +73,11 @@ class ModelGenerator:
             if stripped.startswith("import ") or stripped.startswith("from "):
                 last_import_index = len(new_lines)
 
-            # Меняем "BaseModel" -> "BaseConfigModel"
+            # Модели только для ответов -> BaseResponseModel, остальные "BaseModel" -> "BaseConfigModel"
+            class_match = class_pattern.match(line)
+            if class_match and model_usage.get(class_match.group(1)) == "output":
+                line = line.replace("(BaseModel)", "(BaseResponseModel)", 1)
+                uses_response_base = True
             line = base_model_pattern.sub("BaseConfigModel", line)
 
             # Если это строка вида "from pydantic import ..."
@@ -80,7 +102,8 @@ class ModelGenerator:
                 new_lines.append(line)
 
         if not found_pydantic_config_import:
-            import_line = "from my_codegen.pydantic_utils.pydantic_config import BaseConfigModel\n"
+            base_classes = "BaseConfigModel, BaseResponseModel" if uses_response_base else "BaseConfigModel"
+            import_line = f"from my_codegen.pydantic_utils.pydantic_config import {base_classes}\n"
             if last_import_index >= 0:
                 new_lines.insert(last_import_index + 1, import_line)
             else:
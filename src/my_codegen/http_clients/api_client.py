@@ -1,24 +1,37 @@
+import logging
 import mimetypes
 import os
 import pprint
+from contextlib import closing
 from enum import Enum
-from typing import Union, Dict, List, Optional
+from typing import Any, Callable, Iterator, Union, Dict, List, Optional, Type
 
 import allure
 import requests
 from http import HTTPStatus
 
 from dotenv import load_dotenv
+from pydantic import BaseModel
 
 from requests.adapters import HTTPAdapter, Retry
 
 import json
+import time
 import uuid
 
+from my_codegen.http_clients import msgspec_codec
+from my_codegen.http_clients.coalescing import RequestCoalescer
+from my_codegen.http_clients.metrics import MetricsRegistry, default_registry
+from my_codegen.http_clients.rate_limit import RateLimitedAdapter, RateLimiter
+from my_codegen.http_clients.response_cache import ResponseCache
+from my_codegen.http_clients.streaming import STREAM_CHUNK_SIZE, iter_response_items
+from my_codegen.http_clients.trusted import ConstructPlan, trusted_override
+from my_codegen.http_clients.chunked_upload import ChunkedUploader, ChunkedUploadResult, DEFAULT_PART_SIZE
 from my_codegen.utils.base_url import BaseUrlSingleton
 from my_codegen.utils.logger import allure_report, ApiRequestError, logger
 
 from my_codegen.utils.report_utils import Reporter
+from my_codegen.utils.thread_pool import SharedThreadPool
 
 load_dotenv()
 
@@ -34,8 +47,17 @@ class UUIDEncoder(json.JSONEncoder):
 
 
 class RequestHandler:
-    def __init__(self, auth_token: Optional[str] = None):
+    def __init__(
+            self,
+            auth_token: Optional[str] = None,
+            cache: Optional[ResponseCache] = None,
+            coalescer: Optional[RequestCoalescer] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+    ):
         self.auth_token = auth_token
+        self.cache = cache
+        self.coalescer = coalescer
+        self.rate_limiter = rate_limiter
         self.session = requests.Session()
         self._configure_retries()
 
@@ -46,7 +68,16 @@ class RequestHandler:
             status_forcelist=[502, 504],
             raise_on_status=False,
         )
-        adapter = HTTPAdapter(max_retries=retries)
+        if self.rate_limiter is not None:
+            adapter = RateLimitedAdapter(
+                self.rate_limiter,
+                max_retries=retries,
+                pool_maxsize=SharedThreadPool.max_workers,
+            )
+        else:
+            adapter = HTTPAdapter(
+                max_retries=retries, pool_maxsize=SharedThreadPool.max_workers
+            )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
@@ -66,6 +97,7 @@ class RequestHandler:
             headers: Optional[Dict] = None,
             params: Optional[Dict] = None,
             files: Optional[Dict] = None,
+            data: Optional[bytes] = None,
     ) -> requests.PreparedRequest:
 
         headers = self._add_authorization_header(headers)
@@ -74,10 +106,8 @@ class RequestHandler:
             if not files:
                 headers["Content-Type"] = "application/json"
 
-        if payload is not None and not files:
+        if data is None and payload is not None and not files:
             data = json.dumps(payload, cls=UUIDEncoder)
-        else:
-            data = None
 
         request = requests.Request(
             method=method,
@@ -92,9 +122,58 @@ class RequestHandler:
     def send_request(
             self, prepared_request: requests.PreparedRequest, path: str
     ) -> requests.Response:
-        response = self.session.send(prepared_request)
+        if self.cache is None:
+            return self._send(prepared_request)
+        if prepared_request.method != "GET":
+            response = self._send(prepared_request)
+            if response.ok:
+                self.cache.invalidate(prepared_request.url.split("?", 1)[0])
+            return response
+        return self._send_cached(prepared_request)
+
+    def _send_cached(self, prepared_request: requests.PreparedRequest) -> requests.Response:
+        key = self.cache.make_key(prepared_request)
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh():
+            self.cache.record("hits")
+            return entry.to_response(prepared_request)
+
+        self.cache.record("misses")
+        if entry is not None:
+            if entry.etag:
+                prepared_request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                prepared_request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = self._send(prepared_request)
+        if entry is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            self.cache.refresh(key, entry, response)
+            return entry.to_response(prepared_request)
+
+        self.cache.store(key, response)
+        return response
+
+    def send_stream(self, prepared_request: requests.PreparedRequest) -> requests.Response:
+        """Запрос с потоковым чтением тела (stream=True), мимо кэша ответов"""
+        return self._send(prepared_request, stream=True)
+
+    def _send(self, prepared_request: requests.PreparedRequest, stream: bool = False) -> requests.Response:
+        opened = self._connections_opened()
+        response = self.session.send(prepared_request, stream=stream)
+        response.connections_opened = self._connections_opened() - opened
         return response
 
+    def _connections_opened(self) -> int:
+        """Сколько соединений открыли пулы сессии (приблизительно при параллельных запросах)"""
+        total = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    total += pool.num_connections
+        return total
+
     def validate_response(
             self,
             response: requests.Response,
@@ -121,12 +200,71 @@ class RequestHandler:
 
 
 class ApiClient:
+    _service = ""
+    # Общий кэш GET-ответов для всех клиентов (по умолчанию выключен)
+    response_cache: Optional[ResponseCache] = None
+    # Общий объединитель одинаковых одновременных запросов (по умолчанию выключен)
+    request_coalescer: Optional[RequestCoalescer] = None
+    # Общие лимиты частоты запросов; None - лимиты из API_RATE_LIMITS / API_RATE_LIMITS_FILE,
+    # которые читаются при создании первого клиента
+    rate_limiter: Optional[RateLimiter] = None
+    # Метрики запросов; None отключает сбор
+    metrics: Optional[MetricsRegistry] = default_registry
+    # Доверенный режим: модели ответов собираются model_construct без валидации.
+    # Переопределяется в блоке trusted_responses(True/False)
+    trusted_responses: bool = os.getenv("API_TRUSTED_RESPONSES", "").lower() in ("1", "true", "yes")
+
     def __init__(
-            self, auth_token: Optional[str] = None, base_url: Optional[str] = None
+            self,
+            auth_token: Optional[str] = None,
+            base_url: Optional[str] = None,
+            cache: Optional[ResponseCache] = None,
+            coalescer: Optional[RequestCoalescer] = None,
+            rate_limiter: Optional[RateLimiter] = None,
     ):
         self.base_url = base_url if base_url else BaseUrlSingleton.get_base_url()
         self.auth_token = auth_token
-        self._request_handler = RequestHandler(auth_token)
+        self._request_handler = RequestHandler(
+            auth_token,
+            cache=cache if cache is not None else self.response_cache,
+            coalescer=coalescer if coalescer is not None else self.request_coalescer,
+            rate_limiter=rate_limiter or self.rate_limiter or RateLimiter.default(),
+        )
+
+    def _is_trusted(self) -> bool:
+        override = trusted_override()
+        return self.trusted_responses if override is None else override
+
+    def _build(self, model_class: Type[BaseModel], data: Any) -> Any:
+        """Модель ответа: с валидацией или, в доверенном режиме, через model_construct"""
+        if self._is_trusted():
+            return ConstructPlan.construct(model_class, data)
+        return model_class(**data)
+
+    def _build_list(self, model_class: Type[BaseModel], items: List[Any]) -> List[Any]:
+        if self._is_trusted():
+            return ConstructPlan.construct_list(model_class, items)
+        return [model_class(**item) for item in items]
+
+    @staticmethod
+    def _decode(response_type: Any, content: bytes) -> Any:
+        """Декодирование ответа в msgspec.Struct-модели (клиенты с --model-type msgspec)"""
+        return msgspec_codec.decode(response_type, content)
+
+    @staticmethod
+    def _decode_body(content: bytes) -> Any:
+        return msgspec_codec.decode_body(content)
+
+    @staticmethod
+    def _encode(payload: Any) -> bytes:
+        return msgspec_codec.encode(payload)
+
+    def invalidate_cache(self, prefix: str = "") -> int:
+        """Сбрасывает кэш ответов сервиса клиента для путей, начинающихся с prefix"""
+        cache = self._request_handler.cache
+        if cache is None:
+            return 0
+        return cache.invalidate(f"{self.base_url}{self._service}{prefix}")
 
     def _send_request(
             self,
@@ -136,24 +274,58 @@ class ApiClient:
             headers: Optional[Dict] = None,
             params: Optional[Dict] = None,
             files: Optional[Dict] = None,
+            data: Optional[bytes] = None,
             expected_status: Optional[HTTPStatus] = None,
+            raw: bool = False,
+            path_params: Optional[Dict[str, Any]] = None,
+            report_body: bool = True,
             **kwargs,
     ) -> Union[Dict, List, bytes, None]:
-        formatted_path = path.format(**kwargs)
+        """
+        raw=True - вернуть тело ответа как bytes, без разбора JSON.
+        path_params - значения для подстановки в шаблон пути; отдельный словарь,
+        чтобы параметр пути с именем path/params/payload не конфликтовал с аргументами.
+        report_body=False - не прикладывать тело запроса к отчёту (части файла и т.п.).
+        """
+        formatted_path = path.format(**(path_params or {}), **kwargs)
 
         url = f"{self.base_url}{formatted_path}"
 
-        prepared_request = self._request_handler.prepare_request(
-            method, url, payload, headers, params, files
-        )
-        response = self._request_handler.send_request(prepared_request, path)
+        def perform():
+            started = time.perf_counter()
+            prepared_request = self._request_handler.prepare_request(
+                method, url, payload, headers, params, files, data
+            )
+            response = self._request_handler.send_request(prepared_request, path)
+            if self.metrics is not None:
+                self.metrics.observe(self._service, method, path, response, time.perf_counter() - started)
+            if raw:
+                return response, response.content
+            return response, self._request_handler.process_response(response)
+
+        coalescer = self._request_handler.coalescer
+        if coalescer is not None and coalescer.accepts(method):
+            key = coalescer.make_key(method, url, params, headers, self.auth_token)
+            if raw:
+                key = ("raw", key)
+            response, result = coalescer.do(key, perform)
+        else:
+            response, result = perform()
 
+        request_body = response.request.body if response.request is not None else None
+        if not report_body and request_body:
+            request_body = f"<{len(request_body)} bytes>"
+        allure_report(response, request_body)
         self._request_handler.validate_response(
             response, expected_status, method, payload or params
         )
-        logger.info(f'{response.status_code} | {method} | {formatted_path}')
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                '%s | %s | %s', response.status_code, method, formatted_path,
+                extra=self._log_extra(response),
+            )
 
-        return self._request_handler.process_response(response)
+        return result
 
     def _get(
             self,
@@ -172,6 +344,64 @@ class ApiClient:
             **kwargs,
         )
 
+    def _get_stream(
+            self,
+            path: str,
+            item_type: Any = None,
+            headers: Optional[Dict] = None,
+            params: Optional[Dict] = None,
+            expected_status: HTTPStatus = HTTPStatus.OK,
+            chunk_size: int = STREAM_CHUNK_SIZE,
+            path_params: Optional[Dict[str, Any]] = None,
+            **kwargs,
+    ) -> Iterator[Any]:
+        """
+        GET с потоковым разбором ответа: элементы JSON-массива (или NDJSON по Content-Type)
+        читаются из сокета по мере прихода и отдаются по одному, собранными в item_type.
+        В памяти одновременно только текущий элемент, независимо от размера ответа.
+        Запрос уходит при первом next(); кэш ответов и объединение запросов не используются.
+        """
+        formatted_path = path.format(**(path_params or {}), **kwargs)
+        url = f"{self.base_url}{formatted_path}"
+        build = self._item_builder(item_type)
+
+        started = time.perf_counter()
+        prepared_request = self._request_handler.prepare_request("GET", url, None, headers, params)
+        response = self._request_handler.send_stream(prepared_request)
+        with closing(response):
+            try:
+                if response.status_code != expected_status:
+                    # Тело ошибки небольшое - читаем целиком для отчёта и исключения
+                    allure_report(response, None)
+                    self._request_handler.validate_response(response, expected_status, "GET", params)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        '%s | %s | %s (stream)', response.status_code, "GET", formatted_path,
+                        extra=self._log_extra(response),
+                    )
+                for item in iter_response_items(response, chunk_size):
+                    yield build(item)
+            finally:
+                if self.metrics is not None:
+                    self.metrics.observe(self._service, "GET", path, response, time.perf_counter() - started)
+
+    def _log_extra(self, response: requests.Response) -> Dict[str, Any]:
+        """Поля для StructuredFormatter; собираются, только если INFO включён"""
+        return {
+            "service": self._service or None,
+            "status": response.status_code,
+            "latency": round(response.elapsed.total_seconds(), 4),
+        }
+
+    def _item_builder(self, item_type: Any) -> Callable[[Any], Any]:
+        if item_type is None or item_type is Any:
+            return lambda item: item
+        if isinstance(item_type, type) and issubclass(item_type, BaseModel):
+            return lambda item: self._build(item_type, item)
+        if msgspec_codec.is_struct(item_type):
+            return lambda item: msgspec_codec.convert(item, item_type)
+        return item_type
+
     def _post(
             self,
             path: str,
@@ -198,6 +428,7 @@ class ApiClient:
             params: Optional[Dict] = None,
             headers: Optional[Dict] = None,
             files: Optional[Dict] = None,
+            data: Optional[bytes] = None,
             expected_status: HTTPStatus = HTTPStatus.OK,
             **kwargs,
     ) -> Union[Dict, List]:
@@ -208,6 +439,7 @@ class ApiClient:
             params=params,
             headers=headers,
             files=files,
+            data=data,
             expected_status=expected_status,
             **kwargs,
         )
@@ -265,5 +497,29 @@ class StorageS3(ApiClient):
             files = {"file": (os.path.basename(file_path), f, mime_type)}
             return self._put(files=files)
 
+    def upload_chunked(
+            self,
+            file_path: str,
+            part_size: int = DEFAULT_PART_SIZE,
+            concurrency: int = 4,
+            part_retries: int = 3,
+            resume: bool = True,
+    ) -> ChunkedUploadResult:
+        """
+        Загружает файл частями по part_size байт, до concurrency частей параллельно.
+        При resume=True продолжает ранее прерванную загрузку того же файла.
+        """
+        mime_type, _ = mimetypes.guess_type(file_path)
+        if mime_type is None:
+            mime_type = "application/octet-stream"
+
+        uploader = ChunkedUploader(
+            self,
+            part_size=part_size,
+            concurrency=concurrency,
+            part_retries=part_retries,
+        )
+        return uploader.upload(file_path, mime_type, resume=resume)
+
     def download(self):
         return self._get(path="")
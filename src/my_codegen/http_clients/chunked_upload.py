@@ -0,0 +1,226 @@
+import json
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+import requests
+
+from my_codegen.utils.logger import ApiRequestError, logger
+from my_codegen.utils.thread_pool import SharedThreadPool
+
+if TYPE_CHECKING:
+    from my_codegen.http_clients.api_client import ApiClient
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class UploadPart:
+    number: int
+    offset: int
+    size: int
+    elapsed: float = 0.0
+    attempts: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Скорость загрузки части в байтах в секунду"""
+        return self.size / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class ChunkedUploadResult:
+    file_path: str
+    total_size: int
+    elapsed: float
+    parts: List[UploadPart] = field(default_factory=list)
+    resumed_parts: List[int] = field(default_factory=list)
+    # Ответ на последнюю по номеру часть из загруженных в этом вызове
+    # (сервер обычно отвечает итогом загрузки именно на неё)
+    response: object = None
+
+    @property
+    def throughput(self) -> float:
+        uploaded = sum(part.size for part in self.parts)
+        return uploaded / self.elapsed if self.elapsed else 0.0
+
+
+class ChunkedUploader:
+    """
+    Загружает файл частями: файл читается через mmap, части отправляются
+    параллельно через общий пул потоков запросами PUT с заголовком Content-Range.
+    Загруженные части записываются в файл состояния, поэтому прерванную
+    загрузку можно продолжить повторным вызовом upload().
+
+    Это не S3 Multipart Upload (uploadId/partNumber/CompleteMultipartUpload):
+    у StorageS3 есть только один URL на объект, а для multipart нужны отдельные
+    подписанные URL на каждую часть и на завершение. Сервер по self.path должен
+    принимать PUT частей с Content-Range и собирать объект сам.
+    """
+
+    def __init__(
+            self,
+            client: "ApiClient",
+            path: str = "",
+            part_size: int = DEFAULT_PART_SIZE,
+            concurrency: int = 4,
+            part_retries: int = 3,
+            retry_backoff: float = 1.0,
+            expected_status: HTTPStatus = HTTPStatus.OK,
+            state_dir: Optional[str] = None,
+    ):
+        if part_size <= 0:
+            raise ValueError("part_size must be positive")
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self.client = client
+        self.path = path
+        self.part_size = part_size
+        self.concurrency = concurrency
+        self.part_retries = part_retries
+        self.retry_backoff = retry_backoff
+        self.expected_status = expected_status
+        self.state_dir = state_dir
+        self._state_lock = threading.Lock()
+
+    def upload(self, file_path: str, mime_type: str, resume: bool = True) -> ChunkedUploadResult:
+        total_size = os.path.getsize(file_path)
+        if total_size == 0:
+            # mmap не отображает файл нулевой длины
+            raise ValueError(f"Cannot upload empty file in chunks: {file_path}")
+        state_path = self._state_path(file_path)
+        state = self._load_state(state_path, file_path, total_size) if resume else None
+        if state is None:
+            state = self._new_state(file_path, total_size)
+
+        done: Set[int] = set(state["done"])
+        parts = [
+            UploadPart(number=number, offset=offset, size=min(self.part_size, total_size - offset))
+            for number, offset in enumerate(range(0, total_size, self.part_size), start=1)
+        ]
+        pending = [part for part in parts if part.number not in done]
+        result = ChunkedUploadResult(
+            file_path=file_path,
+            total_size=total_size,
+            elapsed=0.0,
+            resumed_parts=sorted(done),
+        )
+
+        started = time.perf_counter()
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            executor = SharedThreadPool.get_executor()
+            in_flight = {}
+            queue = iter(pending)
+            last_number = 0
+            try:
+                while True:
+                    while len(in_flight) < self.concurrency:
+                        part = next(queue, None)
+                        if part is None:
+                            break
+                        future = executor.submit(self._upload_part, mm, part, mime_type, total_size)
+                        in_flight[future] = part
+                    if not in_flight:
+                        break
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        part = in_flight.pop(future)
+                        response = future.result()
+                        if part.number > last_number:
+                            last_number, result.response = part.number, response
+                        result.parts.append(part)
+                        done.add(part.number)
+                        self._save_state(state_path, state, done)
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                wait(in_flight)
+                raise
+
+        result.elapsed = time.perf_counter() - started
+        result.parts.sort(key=lambda p: p.number)
+        self._remove_state(state_path)
+        logger.info(
+            "Chunked upload %s: %d parts, %d bytes, %.2f MiB/s",
+            os.path.basename(file_path), len(result.parts), total_size, result.throughput / 1024 / 1024,
+        )
+        return result
+
+    def _upload_part(self, mm: mmap.mmap, part: UploadPart, mime_type: str, total_size: int):
+        headers = {
+            "Content-Type": mime_type,
+            "Content-Range": f"bytes {part.offset}-{part.offset + part.size - 1}/{total_size}",
+        }
+        while True:
+            part.attempts += 1
+            started = time.perf_counter()
+            try:
+                response = self.client._put(
+                    path=self.path,
+                    data=mm[part.offset:part.offset + part.size],
+                    headers=dict(headers),
+                    expected_status=self.expected_status,
+                    report_body=False,
+                )
+            except (ApiRequestError, requests.ConnectionError, requests.Timeout) as e:
+                if part.attempts > self.part_retries or not self._retryable(e):
+                    raise
+                logger.warning("Part %d failed (attempt %d): %s", part.number, part.attempts, e.__class__.__name__)
+                time.sleep(self.retry_backoff * 2 ** (part.attempts - 1))
+                continue
+            part.elapsed = time.perf_counter() - started
+            return response
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        """Повторяются обрывы соединения, таймауты, 5xx и 429; прочие 4xx повтором не исправить"""
+        if not isinstance(error, ApiRequestError):
+            return True
+        status = error.response.status_code
+        return status >= 500 or status == HTTPStatus.TOO_MANY_REQUESTS
+
+    # -- состояние для возобновления загрузки --
+    def _state_path(self, file_path: str) -> str:
+        name = os.path.basename(file_path) + ".upload-state.json"
+        directory = self.state_dir or os.path.dirname(os.path.abspath(file_path))
+        return os.path.join(directory, name)
+
+    def _new_state(self, file_path: str, total_size: int) -> Dict:
+        return {
+            "url": f"{self.client.base_url}{self.path}",
+            "size": total_size,
+            "mtime": os.path.getmtime(file_path),
+            "part_size": self.part_size,
+            "done": [],
+        }
+
+    def _load_state(self, state_path: str, file_path: str, total_size: int) -> Optional[Dict]:
+        if not os.path.exists(state_path):
+            return None
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        expected = self._new_state(file_path, total_size)
+        if any(state.get(key) != expected[key] for key in ("url", "size", "mtime", "part_size")):
+            return None
+        return state
+
+    def _save_state(self, state_path: str, state: Dict, done: Set[int]) -> None:
+        with self._state_lock:
+            state["done"] = sorted(done)
+            tmp_path = state_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, state_path)
+
+    @staticmethod
+    def _remove_state(state_path: str) -> None:
+        if os.path.exists(state_path):
+            os.unlink(state_path)
@@ -0,0 +1,99 @@
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+KeyFunc = Callable[[str, str, Optional[Dict], Optional[Dict], Optional[str]], Hashable]
+
+
+def default_request_key(
+        method: str,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        auth_token: Optional[str] = None,
+) -> Hashable:
+    return (
+        method,
+        url,
+        json.dumps(params, sort_keys=True, default=str) if params else "",
+        json.dumps(headers, sort_keys=True, default=str) if headers else "",
+        auth_token,
+    )
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class RequestCoalescer:
+    """
+    Объединяет одновременные одинаковые идемпотентные запросы: пока первый
+    запрос с ключом выполняется, остальные потоки с тем же ключом ждут его
+    и получают тот же результат (или то же исключение).
+
+    Результат общий для всех ожидавших, поэтому изменять его нельзя.
+    """
+
+    def __init__(
+            self,
+            key_func: Optional[KeyFunc] = None,
+            methods: Tuple[str, ...] = ("GET", "HEAD"),
+    ):
+        self.key_func = key_func or default_request_key
+        self.methods = methods
+        self._calls: Dict[Hashable, _InFlightCall] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def accepts(self, method: str) -> bool:
+        return method.upper() in self.methods
+
+    def make_key(
+            self,
+            method: str,
+            url: str,
+            params: Optional[Dict] = None,
+            headers: Optional[Dict] = None,
+            auth_token: Optional[str] = None,
+    ) -> Hashable:
+        return self.key_func(method, url, params, headers, auth_token)
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+from bisect import bisect_left
+from typing import Dict, Optional, Tuple
+
+import requests
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class EndpointMetrics:
+    def __init__(self, service: str, method: str, path: str, buckets: Tuple[float, ...]):
+        self.service = service
+        self.method = method
+        self.path = path
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.statuses: Dict[int, int] = {}
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.connections_opened = 0
+        self.cache_hits = 0
+
+    def observe(self, response: requests.Response, latency: float) -> None:
+        self.count += 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        index = bisect_left(self.buckets, latency)
+        if index < len(self.buckets):
+            self.bucket_counts[index] += 1
+        self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None:
+            self.retries += len(retries.history)
+        body = response.request.body if response.request is not None else None
+        if body:
+            self.bytes_sent += len(body) if isinstance(body, (bytes, str)) else 0
+        streamed = getattr(response, "streamed_bytes", None)
+        self.bytes_received += streamed if streamed is not None else len(response.content or b"")
+        self.connections_opened += getattr(response, "connections_opened", 0)
+        if getattr(response, "from_cache", False):
+            self.cache_hits += 1
+
+    def to_dict(self) -> Dict:
+        cumulative = []
+        total = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            total += count
+            cumulative.append([bound, total])
+        return {
+            "service": self.service,
+            "method": self.method,
+            "path": self.path,
+            "count": self.count,
+            "latency_sum": self.latency_sum,
+            "latency_avg": self.latency_sum / self.count if self.count else 0.0,
+            "latency_max": self.latency_max,
+            "latency_buckets": cumulative,
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items())},
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "connections_opened": self.connections_opened,
+            "connections_reused": max(0, self.count - self.cache_hits - self.connections_opened),
+            "cache_hits": self.cache_hits,
+        }
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    Метрики запросов по ключу (сервис, метод, шаблон пути): гистограмма
+    задержек, коды ответов, ретраи, объём трафика и переиспользование соединений.
+    Выгружается в JSON и в текстовый формат Prometheus.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._endpoints: Dict[Tuple[str, str, str], EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, service: str, method: str, path: str, response: requests.Response, latency: float) -> None:
+        key = (service, method, path)
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = EndpointMetrics(service, method, path, self.buckets)
+            endpoint.observe(response, latency)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            endpoints = [endpoint.to_dict() for endpoint in self._endpoints.values()]
+        endpoints.sort(key=lambda e: (e["service"], e["path"], e["method"]))
+        return {"endpoints": endpoints}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent, ensure_ascii=False)
+
+    def to_prometheus(self, prefix: str = "api_client") -> str:
+        snapshot = self.snapshot()
+        counters = (
+            ("retries", "retries_total", "Retries made by the transport"),
+            ("bytes_sent", "request_bytes_total", "Request body bytes sent"),
+            ("bytes_received", "response_bytes_total", "Response body bytes received"),
+            ("connections_opened", "connections_opened_total", "New connections opened"),
+            ("connections_reused", "connections_reused_total", "Requests sent over a reused connection"),
+            ("cache_hits", "cache_hits_total", "Responses served from the response cache"),
+        )
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds Request latency in seconds",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for endpoint in snapshot["endpoints"]:
+            labels = self._labels(endpoint)
+            for bound, count in endpoint["latency_buckets"]:
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {endpoint["count"]}')
+            lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {endpoint['latency_sum']}")
+            lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {endpoint['count']}")
+
+        lines.append(f"# HELP {prefix}_responses_total Responses by status code")
+        lines.append(f"# TYPE {prefix}_responses_total counter")
+        for endpoint in snapshot["endpoints"]:
+            labels = self._labels(endpoint)
+            for status, count in endpoint["statuses"].items():
+                lines.append(f'{prefix}_responses_total{{{labels},status="{status}"}} {count}')
+
+        for field, name, help_text in counters:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for endpoint in snapshot["endpoints"]:
+                lines.append(f"{prefix}_{name}{{{self._labels(endpoint)}}} {endpoint[field]}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(endpoint: Dict) -> str:
+        return ",".join(
+            f'{name}="{_escape_label(endpoint[name])}"' for name in ("service", "method", "path")
+        )
+
+    def dump(self, directory: str, suffix: str = "") -> None:
+        """Записывает metrics{suffix}.json и metrics{suffix}.prom в directory"""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"metrics{suffix}.json"), "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+        with open(os.path.join(directory, f"metrics{suffix}.prom"), "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+
+default_registry = MetricsRegistry()
@@ -0,0 +1,50 @@
+import threading
+from typing import Any, Dict
+
+import msgspec
+
+_encoder = msgspec.json.Encoder()
+_any_decoder = msgspec.json.Decoder()
+_decoders: Dict[Any, msgspec.json.Decoder] = {}
+_lock = threading.Lock()
+
+
+def decoder_for(type_: Any) -> msgspec.json.Decoder:
+    """Декодер под тип ответа (Struct, List[Struct], примитив); создаётся один раз на тип"""
+    decoder = _decoders.get(type_)
+    if decoder is None:
+        with _lock:
+            decoder = _decoders.get(type_)
+            if decoder is None:
+                decoder = _decoders[type_] = msgspec.json.Decoder(type_)
+    return decoder
+
+
+def decode(type_: Any, content: bytes) -> Any:
+    """Байты ответа -> объекты нужного типа с проверкой схемы, без промежуточных dict"""
+    if not content:
+        return None
+    return decoder_for(type_).decode(content)
+
+
+def decode_body(content: bytes) -> Any:
+    """Тело ответа без схемы (неожиданный статус): JSON, иначе текст - как process_response"""
+    if not content:
+        return None
+    try:
+        return _any_decoder.decode(content)
+    except msgspec.DecodeError:
+        return content.decode("utf-8", errors="replace")
+
+
+def encode(value: Any) -> bytes:
+    return _encoder.encode(value)
+
+
+def is_struct(type_: Any) -> bool:
+    return isinstance(type_, type) and issubclass(type_, msgspec.Struct)
+
+
+def convert(value: Any, type_: Any) -> Any:
+    """Уже разобранный JSON (dict/list) -> объект type_ с проверкой схемы"""
+    return msgspec.convert(value, type_)
@@ -0,0 +1,206 @@
+import contextvars
+import math
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from my_codegen.utils.thread_pool import SharedThreadPool
+
+PageFetch = Callable[[Dict[str, Any]], Any]
+
+
+def _field(response: Any, name: str) -> Any:
+    """Поле ответа по имени из спецификации: dict, pydantic (в т.ч. по alias) или msgspec.Struct"""
+    if isinstance(response, dict):
+        return response.get(name)
+    if isinstance(response, BaseModel):
+        if name not in type(response).model_fields:
+            for field_name, field in type(response).model_fields.items():
+                if field.alias == name:
+                    return getattr(response, field_name, None)
+    return getattr(response, name, None)
+
+
+def _field_int(response: Any, name: Optional[str]) -> Optional[int]:
+    if not name:
+        return None
+    value = _field(response, name)
+    return int(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+class Paginator:
+    """
+    Элементы всех страниц постраничного эндпоинта, по одной странице за запрос.
+    fetch - сгенерированный метод клиента, принимающий query-параметры страницы,
+    поэтому каждая страница проходит обычную валидацию/отчёт/метрики.
+
+    Стили: "page" (номер страницы), "offset" (смещение), "cursor" (курсор из ответа).
+    Конец выдачи - пустая или неполная страница, достигнутое общее количество,
+    отсутствие следующего курсора или курсор, совпадающий с текущим.
+
+    prefetch=True - следующая страница запрашивается в SharedThreadPool,
+    пока вызывающий код обрабатывает текущую.
+    concurrency > 1 - если после первой страницы известно общее количество
+    (total / totalPages), остальные страницы запрашиваются параллельно
+    (не больше concurrency одновременно), элементы отдаются в исходном порядке.
+    """
+
+    def __init__(
+            self,
+            fetch: PageFetch,
+            style: str,
+            page_param: str,
+            size_param: Optional[str] = None,
+            items_field: Optional[str] = None,
+            total_field: Optional[str] = None,
+            total_pages_field: Optional[str] = None,
+            next_cursor_field: Optional[str] = None,
+            first_page: int = 1,
+            params: Optional[Dict[str, Any]] = None,
+            page_size: Optional[int] = None,
+            prefetch: bool = False,
+            concurrency: int = 1,
+            max_pages: Optional[int] = None,
+    ):
+        if style not in ("page", "offset", "cursor"):
+            raise ValueError(f"Unknown pagination style: {style}")
+        self.fetch = fetch
+        self.style = style
+        self.page_param = page_param
+        self.size_param = size_param
+        self.items_field = items_field
+        self.total_field = total_field
+        self.total_pages_field = total_pages_field
+        self.next_cursor_field = next_cursor_field
+        self.first_page = 0 if style == "offset" else first_page
+        self.params = dict(params or {})
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+
+    def __iter__(self) -> Iterator[Any]:
+        for items in self.pages():
+            yield from items
+
+    def pages(self) -> Iterator[List[Any]]:
+        """Списки элементов по страницам"""
+        position = None if self.style == "cursor" else self.first_page
+        pending: Optional[Future] = None
+        # Размер страницы - по первой странице: сервер может урезать запрошенный page_size
+        size = None
+        fetched = 0
+        consumed = 0
+        try:
+            while True:
+                response = pending.result() if pending is not None else self.fetch(self._page_params(position))
+                pending = None
+                fetched += 1
+                items = self._items(response)
+                consumed += len(items)
+                if fetched == 1:
+                    size = len(items)
+
+                total, total_pages = _field_int(response, self.total_field), _field_int(response, self.total_pages_field)
+                previous, position = position, self._next_position(position, response, items)
+                # Сервер, возвращающий текущий курсор вместо следующего, зациклил бы выдачу
+                repeated = self.style == "cursor" and position == previous
+                if repeated or self._is_last(items, size, consumed, fetched, total, total_pages, position):
+                    yield items
+                    return
+
+                if fetched == 1 and self.concurrency > 1 and self.style != "cursor" and size:
+                    positions = self._remaining_positions(position, size, total, total_pages)
+                    if positions is not None:
+                        yield items
+                        yield from self._fetch_concurrently(positions)
+                        return
+
+                if self.prefetch:
+                    pending = self._submit(SharedThreadPool.get_executor(), position)
+                yield items
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def _submit(self, executor: Executor, position: Any) -> Future:
+        # Поток пула не наследует ContextVar вызывающего (trusted_responses и т.п.):
+        # страница запрашивается в копии контекста, отдельной на каждую задачу
+        return executor.submit(contextvars.copy_context().run, self.fetch, self._page_params(position))
+
+    def _page_params(self, position: Any) -> Dict[str, Any]:
+        params = dict(self.params)
+        if position is not None:
+            params[self.page_param] = position
+        if self.size_param and self.page_size is not None:
+            params[self.size_param] = self.page_size
+        return params
+
+    def _items(self, response: Any) -> List[Any]:
+        items = response if self.items_field is None else _field(response, self.items_field)
+        return list(items) if items else []
+
+    def _next_position(self, position: Any, response: Any, items: List[Any]) -> Any:
+        if self.style == "cursor":
+            return _field(response, self.next_cursor_field)
+        if self.style == "offset":
+            return position + len(items)
+        return position + 1
+
+    def _is_last(
+            self,
+            items: List[Any],
+            size: Optional[int],
+            consumed: int,
+            fetched: int,
+            total: Optional[int],
+            total_pages: Optional[int],
+            next_position: Any,
+    ) -> bool:
+        if not items or (self.max_pages is not None and fetched >= self.max_pages):
+            return True
+        if self.style == "cursor":
+            return not next_position
+        if size and len(items) < size:
+            return True
+        if total is not None and consumed >= total:
+            return True
+        return total_pages is not None and fetched >= total_pages
+
+    def _remaining_positions(
+            self, position: int, size: int, total: Optional[int], total_pages: Optional[int]
+    ) -> Optional[List[int]]:
+        """Позиции оставшихся страниц, если общее количество известно; иначе None"""
+        if total_pages is None and total is not None:
+            total_pages = math.ceil(total / size)
+        if total_pages is None:
+            return None
+        if self.max_pages is not None:
+            total_pages = min(total_pages, self.max_pages)
+        if self.style == "offset":
+            return [position + size * i for i in range(total_pages - 1)]
+        return list(range(position, self.first_page + total_pages))
+
+    def _fetch_concurrently(self, positions: List[int]) -> Iterator[List[Any]]:
+        executor = SharedThreadPool.get_executor()
+        remaining = iter(positions)
+        window: Deque[Future] = deque()
+        try:
+            for position in remaining:
+                window.append(self._submit(executor, position))
+                if len(window) >= self.concurrency:
+                    break
+            while window:
+                response = window.popleft().result()
+                position = next(remaining, None)
+                if position is not None:
+                    window.append(self._submit(executor, position))
+                items = self._items(response)
+                if not items:
+                    return
+                yield items
+        finally:
+            for future in window:
+                future.cancel()
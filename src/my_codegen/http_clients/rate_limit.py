@@ -0,0 +1,207 @@
+import copy
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from requests.adapters import HTTPAdapter
+from requests.utils import urlparse
+from urllib3.util.retry import Retry
+
+from my_codegen.utils.logger import logger
+
+
+class TokenBucket:
+    """
+    Token bucket: rate токенов в секунду, не больше burst в запасе.
+    acquire() не отказывает, а ждёт своей очереди, поэтому одновременные
+    вызовы равномерно распределяются во времени.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            # Отрицательный остаток - очередь уже зарезервированных запросов
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Блокирует поток до получения токенов, возвращает время ожидания"""
+        delay = self._reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+@dataclass
+class RateLimitRule:
+    rate: float
+    burst: Optional[float] = None
+    base_url: str = ""
+    path: Optional[str] = None
+
+    def __post_init__(self):
+        self.bucket = TokenBucket(self.rate, self.burst)
+        self._path_pattern = None
+        if self.path:
+            # Шаблон пути "/items/{item_id}" -> регулярка по концу пути URL
+            parts = re.split(r"\{[^}/]+\}", self.path)
+            self._path_pattern = re.compile("[^/]+".join(re.escape(p) for p in parts) + "/?$")
+
+    def matches(self, url: str) -> bool:
+        if self.base_url and not url.startswith(self.base_url):
+            return False
+        if self._path_pattern is not None:
+            return self._path_pattern.search(urlparse(url).path) is not None
+        return True
+
+
+class RateLimiter:
+    """
+    Ограничивает частоту запросов по правилам: правило с base_url задаёт лимит
+    на хост/сервис, правило с path - на конкретный шаблон эндпоинта.
+    Запрос ждёт токены всех подходящих правил.
+
+    Конфигурация - JSON-список правил вида
+    [{"base_url": "https://stage.example.com", "rate": 20, "burst": 5},
+     {"path": "/cde/items/{item_id}", "rate": 2}]
+    из переменной API_RATE_LIMITS или файла из API_RATE_LIMITS_FILE.
+    """
+
+    _default: Optional["RateLimiter"] = None
+    _default_loaded = False
+    _default_lock = threading.Lock()
+
+    def __init__(self, rules: List[RateLimitRule]):
+        self.rules = rules
+        self._lock = threading.Lock()
+        self.waited = 0.0
+        self.throttled = 0
+
+    @classmethod
+    def from_config(cls, config: List[Dict]) -> "RateLimiter":
+        rules = [
+            RateLimitRule(
+                rate=float(item["rate"]),
+                burst=float(item["burst"]) if item.get("burst") is not None else None,
+                base_url=item.get("base_url", ""),
+                path=item.get("path"),
+            )
+            for item in config
+        ]
+        return cls(rules)
+
+    @classmethod
+    def default(cls) -> Optional["RateLimiter"]:
+        """Общий для процесса RateLimiter из окружения, создаётся при первом обращении"""
+        if not cls._default_loaded:
+            with cls._default_lock:
+                if not cls._default_loaded:
+                    cls._default = cls.from_env()
+                    cls._default_loaded = True
+        return cls._default
+
+    @classmethod
+    def from_env(cls) -> Optional["RateLimiter"]:
+        """Лимиты из окружения; ошибка в конфигурации не роняет импорт клиента - лимиты отключаются"""
+        raw = os.getenv("API_RATE_LIMITS")
+        file_path = os.getenv("API_RATE_LIMITS_FILE")
+        try:
+            if not raw and file_path:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    raw = f.read()
+            if not raw:
+                return None
+            return cls.from_config(json.loads(raw))
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning("Rate limits are disabled: invalid API_RATE_LIMITS configuration (%s)", e)
+            return None
+
+    def acquire(self, url: str) -> float:
+        waited = 0.0
+        for rule in self.rules:
+            if rule.matches(url):
+                waited += rule.bucket.acquire()
+        if waited:
+            with self._lock:
+                self.waited += waited
+                self.throttled += 1
+        return waited
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"throttled": self.throttled, "waited": self.waited}
+
+
+class RateLimitedRetry(Retry):
+    """
+    Retry, у которого каждая повторная попытка тоже берёт токен RateLimiter:
+    ретраи urllib3 выполняются внутри HTTPAdapter.send и иначе обходили бы лимит.
+    """
+
+    def __init__(self, *args, rate_limiter: Optional[RateLimiter] = None, retry_url: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+        self.retry_url = retry_url
+
+    def new(self, **kw) -> "RateLimitedRetry":
+        kw.setdefault("rate_limiter", self.rate_limiter)
+        kw.setdefault("retry_url", self.retry_url)
+        return super().new(**kw)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        retry.retry_url = self._full_url(url, _pool)
+        return retry
+
+    def sleep(self, response=None) -> None:
+        super().sleep(response)
+        if self.rate_limiter is not None and self.retry_url:
+            self.rate_limiter.acquire(self.retry_url)
+
+    @classmethod
+    def wrap(cls, retries: Retry, rate_limiter: RateLimiter) -> "RateLimitedRetry":
+        """Копия настроенного Retry (любой версии urllib3) с ожиданием лимита перед повторами"""
+        retry = copy.copy(retries)
+        retry.__class__ = cls
+        retry.rate_limiter = rate_limiter
+        retry.retry_url = None
+        return retry
+
+    @staticmethod
+    def _full_url(url: Optional[str], pool) -> Optional[str]:
+        if not url or url.startswith(("http://", "https://")) or pool is None:
+            return url
+        default_port = {"http": 80, "https": 443}.get(pool.scheme)
+        port = "" if pool.port in (None, default_port) else f":{pool.port}"
+        return f"{pool.scheme}://{pool.host}{port}{url}"
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter, который перед отправкой ждёт разрешения RateLimiter.
+    Повторные попытки (max_retries) тоже проходят через лимит - см. RateLimitedRetry.
+    """
+
+    def __init__(self, rate_limiter: RateLimiter, *args, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(*args, **kwargs)
+        self.max_retries = RateLimitedRetry.wrap(self.max_retries, rate_limiter)
+
+    def send(self, request, *args, **kwargs):
+        self.rate_limiter.acquire(request.url)
+        return super().send(request, *args, **kwargs)
@@ -0,0 +1,225 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+def url_prefix_bounds(url_prefix: str) -> Tuple[str, ...]:
+    """
+    Префиксы, с которых начинаются URL под url_prefix: сам путь продолжается
+    только через "/" или "?", чтобы /items/1 не задевал /items/10.
+    Пустой префикс или оканчивающийся на "/" или "?" сравнивается как есть.
+    """
+    if not url_prefix or url_prefix[-1] in "/?":
+        return (url_prefix,)
+    return (url_prefix + "/", url_prefix + "?")
+
+
+def matches_url_prefix(url: str, url_prefix: str) -> bool:
+    return url == url_prefix or url.startswith(url_prefix_bounds(url_prefix))
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    url: str
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    stored_at: float = 0.0
+    expires_at: float = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    @property
+    def etag(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get("ETag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return CaseInsensitiveDict(self.headers).get("Last-Modified")
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def to_response(self, request: requests.PreparedRequest) -> requests.Response:
+        """Собирает requests.Response из закэшированных данных"""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.url = self.url
+        response.request = request
+        response.reason = "OK"
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+
+def parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    directives = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, arg = item.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+class ResponseCache:
+    """
+    LRU-кэш ответов GET-запросов, ограниченный числом записей и суммарным размером.
+
+    TTL берётся из Cache-Control: max-age ответа, иначе из ttl_by_path
+    (регулярное выражение по пути URL -> секунды), иначе default_ttl.
+    Устаревшие записи с ETag/Last-Modified перепроверяются условным запросом.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 1024,
+            max_bytes: int = 64 * 1024 * 1024,
+            default_ttl: float = 60.0,
+            ttl_by_path: Optional[Dict[str, float]] = None,
+            cacheable_statuses: Tuple[int, ...] = (200, 203),
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in (ttl_by_path or {}).items()]
+        self.cacheable_statuses = cacheable_statuses
+
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # -- ключи и TTL --
+    @staticmethod
+    def make_key(request: requests.PreparedRequest) -> str:
+        auth = request.headers.get("Authorization", "")
+        auth_id = hashlib.sha256(auth.encode()).hexdigest()[:16] if auth else "-"
+        return f"{request.method} {request.url} {auth_id}"
+
+    def ttl_for(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[float]:
+        """Возвращает TTL для ответа или None, если ответ нельзя кэшировать"""
+        cache_control = parse_cache_control(CaseInsensitiveDict(headers or {}).get("Cache-Control", ""))
+        if "no-store" in cache_control:
+            return None
+        if "no-cache" in cache_control:
+            return 0.0
+        max_age = cache_control.get("s-maxage") or cache_control.get("max-age")
+        if max_age is not None:
+            try:
+                return float(max_age)
+            except ValueError:
+                pass
+
+        path = requests.utils.urlparse(url).path
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    # -- операции с записями --
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(self, key: str, response: requests.Response) -> Optional[CachedResponse]:
+        if response.status_code not in self.cacheable_statuses:
+            return None
+        headers = dict(response.headers)
+        ttl = self.ttl_for(response.url, headers)
+        if ttl is None:
+            return None
+
+        now = time.time()
+        entry = CachedResponse(
+            status_code=response.status_code,
+            url=response.url,
+            content=response.content,
+            headers=headers,
+            stored_at=now,
+            expires_at=now + ttl,
+        )
+        if entry.size > self.max_bytes:
+            return None
+        self._put(key, entry)
+        self.record("stores")
+        return entry
+
+    def refresh(self, key: str, entry: CachedResponse, response: requests.Response) -> None:
+        """Продлевает запись после ответа 304 Not Modified"""
+        headers = dict(entry.headers)
+        headers.update({k: v for k, v in response.headers.items() if k.lower() in ("cache-control", "etag", "expires")})
+        entry.headers = headers
+        entry.stored_at = time.time()
+        entry.expires_at = entry.stored_at + (self.ttl_for(entry.url, headers) or 0.0)
+        self._put(key, entry)
+        self.record("revalidations")
+
+    def _put(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._evict()
+
+    def invalidate(self, url_prefix: str = "") -> int:
+        """Удаляет записи с URL url_prefix и вложенными в него путями (пустой префикс - все)"""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if matches_url_prefix(entry.url, url_prefix)]
+            for key in keys:
+                self._bytes -= self._entries.pop(key).size
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def record(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
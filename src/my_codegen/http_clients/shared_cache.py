@@ -0,0 +1,213 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from my_codegen.http_clients.response_cache import CachedResponse, ResponseCache, url_prefix_bounds
+
+# Строк на одну выборку кандидатов при вытеснении
+EVICT_BATCH = 256
+
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    content BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at);
+CREATE INDEX IF NOT EXISTS responses_url ON responses (url);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, entries, bytes)
+    SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM responses;
+CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN
+    UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN
+    UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 1;
+END;
+COMMIT;
+"""
+
+
+def default_cache_path() -> str:
+    """
+    API_SHARED_CACHE_PATH, иначе файл текущего запуска pytest-xdist (общий для его
+    воркеров и ничей больше). Вне xdist общий кэш включается только явным путём.
+    """
+    path = os.getenv("API_SHARED_CACHE_PATH")
+    if path:
+        return path
+    run_id = os.getenv("PYTEST_XDIST_TESTRUNUID")
+    if run_id:
+        return os.path.join(tempfile.gettempdir(), f"my_codegen_response_cache-{run_id}.sqlite")
+    raise ValueError("SqliteResponseCache needs a path: pass path= or set API_SHARED_CACHE_PATH")
+
+
+class SqliteResponseCache(ResponseCache):
+    """
+    Кэш GET-ответов в файле sqlite, общий для всех процессов на машине
+    (например, для воркеров pytest-xdist): ответ, полученный одним воркером,
+    переиспользуют остальные.
+
+    База работает в режиме WAL, поэтому чтение не блокируется записью и само
+    ничего не пишет. Из-за этого при превышении лимитов вытесняются самые
+    старые по времени сохранения записи, а не наименее используемые.
+    Число записей и их размер ведут триггеры в таблице totals, так что проверка
+    лимитов при записи не пересчитывает всю таблицу.
+    Счётчики hits/misses считаются в пределах процесса.
+    """
+
+    def __init__(
+            self,
+            path: Optional[str] = None,
+            max_entries: int = 10000,
+            max_bytes: int = 512 * 1024 * 1024,
+            default_ttl: float = 300.0,
+            ttl_by_path: Optional[Dict[str, float]] = None,
+            cacheable_statuses: Tuple[int, ...] = (200, 203),
+            busy_timeout: float = 10.0,
+    ):
+        super().__init__(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            default_ttl=default_ttl,
+            ttl_by_path=ttl_by_path,
+            cacheable_statuses=cacheable_statuses,
+        )
+        self.path = path or default_cache_path()
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._init_db()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Соединение своё для каждого потока и процесса: sqlite не разрешает
+        # использовать одно соединение после fork или из разных потоков
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Без этого INSERT OR REPLACE не запускает триггер удаления и totals расходится
+            conn.execute("PRAGMA recursive_triggers=ON")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_db(self) -> None:
+        self._connection().executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        row = self._connection().execute(
+            "SELECT url, status_code, headers, content, stored_at, expires_at "
+            "FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        url, status_code, headers, content, stored_at, expires_at = row
+        return CachedResponse(
+            status_code=status_code,
+            url=url,
+            content=bytes(content),
+            headers=json.loads(headers),
+            stored_at=stored_at,
+            expires_at=expires_at,
+        )
+
+    def _put(self, key: str, entry: CachedResponse) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, status_code, headers, content, size, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.url,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    sqlite3.Binary(entry.content),
+                    entry.size,
+                    entry.stored_at,
+                    entry.expires_at,
+                ),
+            )
+            self._evict_rows(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict_rows(self, conn: sqlite3.Connection) -> None:
+        count, total = self._totals(conn)
+        evicted = 0
+        while count > self.max_entries or total > self.max_bytes:
+            keys = []
+            rows = conn.execute(
+                "SELECT key, size FROM responses ORDER BY stored_at LIMIT ?", (EVICT_BATCH,)
+            ).fetchall()
+            for key, size in rows:
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                keys.append((key,))
+                count -= 1
+                total -= size
+            if not keys:
+                break
+            conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+            evicted += len(keys)
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    @staticmethod
+    def _totals(conn: sqlite3.Connection) -> Tuple[int, int]:
+        return conn.execute("SELECT entries, bytes FROM totals WHERE id = 1").fetchone()
+
+    def invalidate(self, url_prefix: str = "") -> int:
+        # Точное сравнение префикса: LIKE не различает регистр и трактует % и _ как шаблон.
+        # Границы те же, что у ResponseCache.invalidate (см. url_prefix_bounds)
+        bounds = url_prefix_bounds(url_prefix)
+        cursor = self._connection().execute(
+            "DELETE FROM responses WHERE url = ? OR substr(url, 1, ?) IN (%s)" % ", ".join("?" * len(bounds)),
+            (url_prefix, len(bounds[0]), *bounds),
+        )
+        with self._lock:
+            self.invalidations += cursor.rowcount
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """Удаляет просроченные записи без валидаторов (их нельзя перепроверить)"""
+        rows = self._connection().execute(
+            "SELECT key, headers FROM responses WHERE expires_at < ?", (time.time(),)
+        ).fetchall()
+        keys = []
+        for key, headers in rows:
+            entry = CachedResponse(status_code=0, url="", content=b"", headers=json.loads(headers))
+            if not entry.etag and not entry.last_modified:
+                keys.append(key)
+        self._connection().executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in keys])
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        count, total = self._totals(self._connection())
+        stats = super().stats()
+        stats.update({"entries": count, "bytes": total})
+        return stats
+
+    def __len__(self) -> int:
+        return self._totals(self._connection())[0]
@@ -0,0 +1,153 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+import requests
+
+STREAM_CHUNK_SIZE = 64 * 1024
+NDJSON_CONTENT_TYPES = (
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+)
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_END = _WHITESPACE + ",]"
+# Буфер сдвигается, когда разобранная часть больше этого числа символов
+_COMPACT_THRESHOLD = 64 * 1024
+
+
+class JsonArrayStream:
+    """
+    Инкрементальный разбор JSON-массива верхнего уровня из потока байтов:
+    элементы отдаются по одному, по мере прихода, в памяти держится
+    только текущий элемент и недочитанный хвост чанка.
+
+        for item in JsonArrayStream(response.iter_content(65536)):
+            ...
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._next_char() != "[":
+            raise ValueError("Expected a JSON array at the top level of the response")
+        self._pos += 1
+        if self._next_char() == "]":
+            self._pos += 1
+            self._check_tail()
+            return
+        while True:
+            yield self._decode_value()
+            char = self._next_char()
+            self._pos += 1
+            if char == "]":
+                self._check_tail()
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+
+    def _read(self, min_chars: int = 1) -> bool:
+        """Дочитывает в буфер не меньше min_chars символов (или до конца); False - поток закончился"""
+        if self._eof:
+            return False
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        parts = []
+        added = 0
+        for chunk in self._chunks:
+            if chunk:
+                text = self._text.decode(chunk)
+                parts.append(text)
+                added += len(text)
+                if added >= min_chars:
+                    break
+        else:
+            parts.append(self._text.decode(b"", final=True))
+            self._eof = True
+        self._buffer += "".join(parts)
+        return added > 0 or not self._eof
+
+    def _next_char(self) -> str:
+        """Пропускает пробелы и возвращает следующий символ ("" в конце потока)"""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._read():
+                return ""
+
+    def _decode_value(self) -> Any:
+        self._next_char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Элемент не дочитан: буфер растёт вдвое, чтобы большой элемент
+                # не разбирался заново на каждом чанке
+                if self._read(len(self._buffer) - self._pos):
+                    continue
+                raise
+            # Число на границе чанка может продолжиться в следующем ("1" + "e-07"):
+            # принимаем его, только когда за ним уже есть разделитель
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                self._pos = end
+                return value
+            if (end < len(self._buffer) and self._buffer[end] in _NUMBER_END) or not self._read():
+                self._pos = end
+                return value
+
+    def _check_tail(self) -> None:
+        if self._next_char():
+            raise ValueError("Unexpected data after the end of the JSON array")
+
+
+def iter_ndjson(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """NDJSON / JSON Lines: по одному JSON-значению на строку, пустые строки пропускаются"""
+    line = bytearray()
+    for chunk in chunks:
+        start = 0
+        newline = chunk.find(b"\n")
+        while newline != -1:
+            line += chunk[start:newline]
+            if line.strip():
+                yield json.loads(line)
+            line.clear()
+            start = newline + 1
+            newline = chunk.find(b"\n", start)
+        line += chunk[start:]
+    if line.strip():
+        yield json.loads(line)
+
+
+def is_ndjson(response: requests.Response) -> bool:
+    content_type = response.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+    return content_type in NDJSON_CONTENT_TYPES
+
+
+def _counted(response: requests.Response, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    # response.content у потокового ответа недоступен - метрики берут размер отсюда
+    response.streamed_bytes = 0
+    for chunk in chunks:
+        response.streamed_bytes += len(chunk)
+        yield chunk
+
+
+def iter_response_items(response: requests.Response, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+    """Элементы ответа, полученного с stream=True: NDJSON по Content-Type, иначе JSON-массив"""
+    chunks = _counted(response, response.iter_content(chunk_size))
+    if is_ndjson(response):
+        return iter_ndjson(chunks)
+    return iter(JsonArrayStream(chunks))
@@ -0,0 +1,292 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, RootModel
+
+Builder = Callable[[Any], Any]
+
+_override: ContextVar[Optional[bool]] = ContextVar("trusted_responses", default=None)
+
+
+@contextmanager
+def trusted_responses(enabled: bool = True) -> Iterator[None]:
+    """
+    Включает (или при enabled=False выключает) доверенный режим ответов внутри блока,
+    независимо от ApiClient.trusted_responses. Действует в текущем потоке/контексте:
+
+        with trusted_responses(False):
+            item = api.items.get_item(item_id)  # полная валидация
+    """
+    token = _override.set(enabled)
+    try:
+        yield
+    finally:
+        _override.reset(token)
+
+
+def trusted_override() -> Optional[bool]:
+    return _override.get()
+
+
+_MISSING = object()
+# Значения по умолчанию этих типов можно разделять между экземплярами
+_IMMUTABLE = (type(None), bool, int, float, complex, str, bytes, Enum)
+
+
+class LazyModelList(list):
+    """
+    Список моделей, элементы которого собираются при первом обращении по индексу;
+    итерация, сравнение и прочие операции собирают весь список один раз.
+    len() и bool() сборку не запускают.
+    """
+
+    __slots__ = ("_build", "_pending")
+
+    def __init__(self, items: List[Any], build: Builder):
+        super().__init__(items)
+        self._build = build
+        self._pending = True
+
+    def _materialize(self) -> None:
+        if self._pending:
+            build = self._build
+            for index, value in enumerate(list.__iter__(self)):
+                if isinstance(value, dict):
+                    list.__setitem__(self, index, build(value))
+            self._pending = False
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._materialize()
+            return list.__getitem__(self, index)
+        value = list.__getitem__(self, index)
+        if self._pending and isinstance(value, dict):
+            value = self._build(value)
+            list.__setitem__(self, index, value)
+        return value
+
+    def __iter__(self):
+        self._materialize()
+        return list.__iter__(self)
+
+    def __reversed__(self):
+        self._materialize()
+        return list.__reversed__(self)
+
+    def __contains__(self, item) -> bool:
+        self._materialize()
+        return list.__contains__(self, item)
+
+    def __eq__(self, other) -> bool:
+        self._materialize()
+        return list.__eq__(self, other)
+
+    def __ne__(self, other) -> bool:
+        self._materialize()
+        return list.__ne__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        self._materialize()
+        return list.__repr__(self)
+
+    def __add__(self, other):
+        self._materialize()
+        return list.__add__(self, other)
+
+    def __reduce_ex__(self, protocol):
+        self._materialize()
+        return list, (list(list.__iter__(self)),)
+
+    def copy(self) -> List[Any]:
+        self._materialize()
+        return list(list.__iter__(self))
+
+    def index(self, *args):
+        self._materialize()
+        return list.index(self, *args)
+
+    def count(self, item) -> int:
+        self._materialize()
+        return list.count(self, item)
+
+    def pop(self, *args):
+        self._materialize()
+        return list.pop(self, *args)
+
+    def remove(self, item) -> None:
+        self._materialize()
+        list.remove(self, item)
+
+    def sort(self, *args, **kwargs) -> None:
+        self._materialize()
+        list.sort(self, *args, **kwargs)
+
+
+class _ModelSpec:
+    """План сборки одного класса модели"""
+
+    __slots__ = ("names", "required", "aliases", "defaults", "factories", "nested")
+
+    def __init__(self, model_class: Type[BaseModel]):
+        self.names = frozenset(model_class.model_fields)
+        self.required = frozenset(name for name, field in model_class.model_fields.items() if field.is_required())
+        # alias -> имя поля, только для полей с отличающимся alias
+        self.aliases: Dict[str, str] = {}
+        # Все поля в порядке объявления: обязательные - с заглушкой, которая удаляется, если поля нет в JSON
+        self.defaults: Dict[str, Any] = {}
+        self.factories: List[Tuple[str, Callable[[], Any]]] = []
+        self.nested: List[Tuple[str, Builder]] = []
+        for name, field in model_class.model_fields.items():
+            if field.alias and field.alias != name:
+                self.aliases[field.alias] = name
+            shared = not field.is_required() and field.default_factory is None and isinstance(field.default, _IMMUTABLE)
+            self.defaults[name] = field.default if shared else None
+            if not field.is_required() and not shared:
+                # default_factory или изменяемое значение по умолчанию (копия, как в pydantic) - на каждый экземпляр
+                self.factories.append((name, partial(field.get_default, call_default_factory=True)))
+            build = ConstructPlan.builder(field.annotation)
+            if build is not None:
+                self.nested.append((name, build))
+
+
+def _container_builder(item: Builder, container: type) -> Builder:
+    def build(value):
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            return value
+        items = [item(v) for v in value]
+        if container is list:
+            return items
+        try:
+            return container(items)
+        except TypeError:
+            # Незамороженные модели не хэшируются - множество остаётся списком
+            return items
+    return build
+
+
+class ConstructPlan:
+    """
+    Сборка моделей ответа без валидации по всему дереву.
+    Для каждого класса один раз вычисляется план: alias полей, значения
+    по умолчанию и сборщики вложенных моделей (в т.ч. в List/Dict/Optional/RootModel).
+    Экземпляр создаётся заполнением __dict__ напрямую (копия значений
+    по умолчанию + update из JSON; изменяемые значения по умолчанию копируются
+    для каждого экземпляра), без поштучного разбора полей,
+    как это делает model_construct; список моделей верхнего уровня собирается
+    лениво (LazyModelList), вложенные контейнеры - сразу. Значения остаются
+    в том виде, в каком пришли в JSON (UUID и даты - строками, enum - значениями).
+    """
+
+    _plans: Dict[type, Optional[_ModelSpec]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def construct(cls, model_class: Type[BaseModel], data: Any) -> Any:
+        if not isinstance(data, dict):
+            return data
+        try:
+            spec = cls._plans[model_class]
+        except KeyError:
+            with cls._lock:
+                spec = cls._plans.get(model_class, _MISSING)
+                if spec is _MISSING:
+                    spec = cls._plans[model_class] = cls._compile(model_class)
+        if spec is None:
+            return cls._construct_slow(model_class, data)
+
+        if spec.aliases:
+            data = {spec.aliases.get(key, key): value for key, value in data.items()}
+        if not data.keys() <= spec.names:
+            data = {key: value for key, value in data.items() if key in spec.names}
+        values = dict(spec.defaults)
+        values.update(data)
+        for name in spec.required - data.keys():
+            del values[name]
+        for name, factory in spec.factories:
+            if name not in data:
+                values[name] = factory()
+        for name, build in spec.nested:
+            value = data.get(name)
+            if value is not None:
+                values[name] = build(value)
+
+        instance = model_class.__new__(model_class)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__pydantic_fields_set__", set(data))
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+    @classmethod
+    def construct_list(cls, model_class: Type[BaseModel], items: List[Any]) -> List[Any]:
+        build = cls.builder(model_class)
+        # Лениво - только список верхнего уровня из моделей-объектов;
+        # элементы RootModel не dict, их LazyModelList не собрал бы
+        if issubclass(model_class, RootModel):
+            return [build(item) for item in items]
+        return LazyModelList(items, build)
+
+    @classmethod
+    def _construct_slow(cls, model_class: Type[BaseModel], data: Dict[str, Any]) -> Any:
+        values = dict(data)
+        for name, field in model_class.model_fields.items():
+            build = cls.builder(field.annotation)
+            key = field.alias or name
+            if build is not None and values.get(key) is not None:
+                values[key] = build(values[key])
+        return model_class.model_construct(**values)
+
+    @classmethod
+    def _compile(cls, model_class: Type[BaseModel]) -> Optional[_ModelSpec]:
+        # Приватные атрибуты и extra='allow' требуют полной логики model_construct
+        if model_class.__private_attributes__ or model_class.model_config.get("extra") == "allow":
+            return None
+        return _ModelSpec(model_class)
+
+    @classmethod
+    def builder(cls, annotation: Any) -> Optional[Builder]:
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+
+        if origin is Union:
+            variants = [arg for arg in args if arg is not type(None)]
+            # Union из нескольких моделей без дискриминатора оставляем как есть
+            return cls.builder(variants[0]) if len(variants) == 1 else None
+
+        # Вложенные контейнеры собираются сразу: pydantic-core при model_dump читает
+        # список напрямую, мимо ленивой сборки LazyModelList
+        if origin is tuple and args and not (len(args) == 2 and args[1] is Ellipsis):
+            items = [cls.builder(arg) for arg in args]
+            if not any(items):
+                return None
+            return lambda value: tuple(
+                build(v) if build is not None else v for build, v in zip(items, value)
+            ) if isinstance(value, (list, tuple)) else value
+
+        if origin in (list, set, frozenset, tuple):
+            item = cls.builder(args[0]) if args else None
+            if item is None:
+                return None
+            return _container_builder(item, origin)
+
+        if origin in (dict, Dict):
+            item = cls.builder(args[1]) if len(args) > 1 else None
+            if item is None:
+                return None
+            return lambda value: {k: item(v) for k, v in value.items()} if isinstance(value, dict) else value
+
+        if isinstance(annotation, type) and issubclass(annotation, RootModel):
+            root = cls.builder(annotation.model_fields["root"].annotation)
+            if root is None:
+                return lambda value: annotation.model_construct(root=value)
+            return lambda value: annotation.model_construct(root=root(value))
+
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return lambda value: cls.construct(annotation, value)
+        return None
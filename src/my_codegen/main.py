@@ -9,11 +9,12 @@ from my_codegen.codegen.client_generator import ClientGenerator
 from my_codegen.codegen.model_generator import ModelGenerator
 from my_codegen.swagger.loader import SwaggerLoader
 from my_codegen.swagger.processor import SwaggerProcessor
-from my_codegen.utils.logger import logger
+from my_codegen.utils.logger import configure_logging, logger
 load_dotenv()
 
 
 def main():
+    configure_logging()
     # 1. Fetch SWAGGER_URL from .env or environment variables
     swagger_path = 'swagger.json'
     parser = argparse.ArgumentParser(description="API Client Generator")
@@ -22,11 +23,24 @@ def main():
         help="URL to download the Swagger JSON from",
         required=True
     )
+    parser.add_argument(
+        "--response-models",
+        action="store_true",
+        help="Models used only in responses inherit the frozen BaseResponseModel "
+             "instead of BaseConfigModel (no validation on assignment)",
+    )
+    parser.add_argument(
+        "--model-type",
+        choices=["pydantic", "msgspec"],
+        default="pydantic",
+        help="Model classes to generate: pydantic BaseModel (default) or msgspec.Struct "
+             "(responses are decoded straight from bytes, faster for large payloads)",
+    )
     args = parser.parse_args()
 
     swagger_url = args.swagger_url
     if swagger_url:
-        logger.info(f"Swagger URL from CLI: {swagger_url}")
+        logger.info("Swagger URL from CLI: %s", swagger_url)
     else:
         logger.info("No CLI swagger-url provided, will fallback to environment variable")
     loader = SwaggerLoader(swagger_path)
@@ -38,7 +52,7 @@ def main():
     loader.load()
     swagger_dict = loader.swagger
     service_name = loader.get_service_name()
-    logger.info(f"Service identified as: {service_name}")
+    logger.info("Service identified as: %s", service_name)
 
     # 3. Create output directories
     base_output_dir = 'http_clients'
@@ -46,15 +60,16 @@ def main():
     endpoints_dir = os.path.join(service_dir, "endpoints")
     os.makedirs(service_dir, exist_ok=True)
     os.makedirs(endpoints_dir, exist_ok=True)
-    logger.info(f"Created directories for service: '{service_dir}' and '{endpoints_dir}'")
+    logger.info("Created directories for service: '%s' and '%s'", service_dir, endpoints_dir)
 
     # 4. Generate models -> http_clients/<service_name>/models.py
     models_file = os.path.join(service_dir, "models")
-    model_gen = ModelGenerator(swagger_path, models_file)
-    logger.info("Generating Pydantic models (via datamodel-codegen)...")
+    model_gen = ModelGenerator(swagger_path, models_file, model_type=args.model_type)
+    logger.info("Generating %s models (via datamodel-codegen)...", args.model_type)
     model_gen.generate_models()
     logger.info("Models generated. Fixing BaseModel->BaseConfigModel inheritance...")
-    model_gen.fix_models_inheritance()
+    model_usage = SwaggerProcessor(swagger_dict).analyze_model_usage() if args.response_models else None
+    model_gen.fix_models_inheritance(model_usage)
     logger.info("Model inheritance fixed. Ready for further processing.")
 
     # 5. Parse the Swagger to extract endpoints and imports
@@ -62,20 +77,23 @@ def main():
     processor = SwaggerProcessor(swagger_dict)
     endpoints = processor.extract_endpoints()
     imports = processor.extract_imports()
-    logger.info(f"Found {len(endpoints)} endpoints and {len(imports)} imports.")
+    imports_by_tag = processor.extract_imports_by_tag(endpoints)
+    logger.info("Found %d endpoints and %d imports.", len(endpoints), len(imports))
 
     # 6. Generate client classes -> http_clients/<service_name>/endpoints/*.py
     logger.info("Generating client classes (by swagger tags)...")
     client_gen = ClientGenerator(
         endpoints=endpoints,
         imports=imports,
-        template_name='client_template.j2'
+        template_name='client_template.j2',
+        model_type=args.model_type,
+        imports_by_tag=imports_by_tag,
     )
     file_to_class = client_gen.generate_clients(endpoints_dir, service_name)
-    logger.info(f"Generated {len(file_to_class)} client files.")
+    logger.info("Generated %d client files.", len(file_to_class))
 
     # 7. Auto-format (autoflake, black)
-    logger.info(f"Running auto-format (autoflake, black) on '{service_dir}'...")
+    logger.info("Running auto-format (autoflake, black) on '%s'...", service_dir)
     model_gen.post_process_code(service_dir)
     logger.info("Auto-format completed.")
 
@@ -99,7 +117,8 @@ def main():
     logger.info("Global facade (api_facade.py) generated successfully.")
 
     logger.info(
-        f"Clients (endpoints/*.py), models, and facade for service '{service_name}' have been created at '{service_dir}'.")
+        "Clients (endpoints/*.py), models, and facade for service '%s' have been created at '%s'.",
+        service_name, service_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,294 @@
+import copy
+import json
+import string
+import threading
+from datetime import datetime, date, timedelta
+from enum import Enum
+from itertools import islice
+from typing import (
+    Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union,
+    get_args, get_origin, Annotated
+)
+from uuid import UUID
+
+import numpy as np
+from faker import Faker
+from pydantic import BaseModel, RootModel
+from pydantic_core import to_jsonable_python
+
+from my_codegen.pydantic_utils.context import GeneratorContext
+from my_codegen.pydantic_utils.data_generator_pydantic import (
+    FLOAT_RANGE, INT_RANGE, RandomValueGenerator, default_context, string_length
+)
+
+# (контекст, n) -> список из n значений
+ColumnProducer = Callable[[GeneratorContext, int], List[Any]]
+
+POOL_SIZE = 1024
+# Пулы одинаковы во всех процессах, случайность - только в выборе индексов
+POOL_SEED = 0
+_ALPHABET = np.array(list(string.ascii_letters))
+_IMMUTABLE = (type(None), bool, int, float, complex, str, bytes, Enum, UUID, datetime, date)
+
+
+class ValuePools:
+    """
+    Заранее сгенерированные корпуса Faker: значения в пакете выбираются
+    из пула индексами NumPy RNG вместо отдельного вызова Faker на каждое поле.
+    """
+
+    _pools: Dict[str, np.ndarray] = {}
+    _lock = threading.Lock()
+    _fake = Faker()
+
+    @classmethod
+    def get(cls, name: str) -> np.ndarray:
+        pool = cls._pools.get(name)
+        if pool is None:
+            with cls._lock:
+                pool = cls._pools.get(name)
+                if pool is None:
+                    pool = cls._pools[name] = cls._sample(name)
+        return pool
+
+    @classmethod
+    def _sample(cls, name: str) -> np.ndarray:
+        cls._fake.seed_instance(POOL_SEED)
+        if name == "text":
+            values = [cls._fake.text(max_nb_chars=20) for _ in range(POOL_SIZE)]
+        elif name == "word":
+            values = cls._fake.words(nb=POOL_SIZE)
+        else:
+            raise KeyError(name)
+        return np.array(values, dtype=object)
+
+    @classmethod
+    def choice(cls, name: str, rng: np.random.Generator, n: int) -> List[Any]:
+        pool = cls.get(name)
+        return pool[rng.integers(0, len(pool), n)].tolist()
+
+
+def _random_strings(rng: np.random.Generator, n: int, min_len: int, max_len: int) -> List[str]:
+    lengths = rng.integers(min_len, max_len + 1, n)
+    chars = _ALPHABET[rng.integers(0, len(_ALPHABET), int(lengths.sum()))].tolist()
+    result = []
+    position = 0
+    for length in lengths.tolist():
+        result.append("".join(chars[position:position + length]))
+        position += length
+    return result
+
+
+def _random_uuids(rng: np.random.Generator, n: int) -> List[str]:
+    raw = np.frombuffer(rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # версия 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # вариант RFC 4122
+    return [str(UUID(bytes=row.tobytes())) for row in raw]
+
+
+def _split(values: List[Any], counts: List[int], container: type = list) -> List[Any]:
+    iterator = iter(values)
+    return [container(islice(iterator, count)) for count in counts]
+
+
+def _sorted_list(values: Iterable[Any]) -> List[Any]:
+    """
+    Множество как отсортированный список: порядок обхода set из строк
+    зависит от PYTHONHASHSEED и отличается между процессами
+    """
+    values = list(values)
+    try:
+        return sorted(values)
+    except TypeError:
+        return sorted(values, key=repr)
+
+
+def _jsonable(value: Any) -> Any:
+    """to_jsonable_python, но множества (и в моделях) - отсортированными списками"""
+    if isinstance(value, (set, frozenset)):
+        return _sorted_list(_jsonable(item) for item in value)
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {to_jsonable_python(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, RootModel):
+        return _jsonable(value.root)
+    if isinstance(value, BaseModel):
+        return {name: _jsonable(getattr(value, name, None)) for name in type(value).model_fields}
+    return to_jsonable_python(value)
+
+
+def _constant(value: Any) -> ColumnProducer:
+    return lambda ctx, n: [value] * n
+
+
+def _repeat(value: Any, n: int) -> List[Any]:
+    """Одно значение для n записей; изменяемые значения копируются, чтобы записи не делили объект"""
+    if isinstance(value, _IMMUTABLE):
+        return [value] * n
+    return [copy.deepcopy(value) for _ in range(n)]
+
+
+class BatchGenerator:
+    """
+    Пакетная генерация: для каждого поля модели генерируется сразу колонка
+    из n значений (числа, UUID, выбор enum - векторно через NumPy RNG,
+    строки - из пулов ValuePools), затем колонки собираются в n записей.
+
+    as_models=True - экземпляры моделей (model_construct),
+    as_models=False - JSON-совместимые dict без создания моделей.
+    Значения распределены так же, как у RandomValueGenerator; типы без
+    векторного пути генерируются его же скомпилированными планами.
+    """
+
+    _plans: Dict[Tuple[Any, int, int, bool], ColumnProducer] = {}
+    _lock = threading.RLock()
+
+    def __init__(self, max_depth: int = 3, as_models: bool = True):
+        self.max_depth = max_depth
+        self.as_models = as_models
+
+    def generate(
+            self,
+            model_class: type,
+            n: int,
+            context: Optional[GeneratorContext] = None,
+            current_depth: int = 0,
+            fixed: Optional[Dict[str, Any]] = None,
+            required_only: bool = False,
+    ) -> List[Any]:
+        ctx = context or default_context
+        columns = {name: _repeat(value, n) for name, value in (fixed or {}).items()}
+        for name, is_optional, produce in self._model_fields(model_class, current_depth):
+            if name in columns or (required_only and is_optional):
+                continue
+            columns[name] = produce(ctx, n)
+        return self._assemble(model_class, columns, n)
+
+    def _assemble(self, model_class: type, columns: Dict[str, List[Any]], n: int) -> List[Any]:
+        names = list(columns)
+        rows = (dict(zip(names, values)) for values in zip(*columns.values())) if names else ({} for _ in range(n))
+        if self.as_models:
+            return [model_class.model_construct(**row) for row in rows]
+        return list(rows)
+
+    def _model_fields(self, model_class: type, current_depth: int) -> List[Tuple[str, bool, ColumnProducer]]:
+        fields = []
+        for field_name, field_info in model_class.model_fields.items():
+            annotation = field_info.annotation
+            args = get_args(annotation)
+            is_optional = get_origin(annotation) is Union and type(None) in args
+            real_type = next(a for a in args if a is not type(None)) if is_optional else annotation
+            fields.append((field_name, is_optional, self.compile(real_type, current_depth)))
+        return fields
+
+    def compile(self, field_type: Any, current_depth: int = 0) -> ColumnProducer:
+        key = (field_type, current_depth, self.max_depth, self.as_models)
+        try:
+            producer = self._plans.get(key)
+        except TypeError:
+            return self._compile(field_type, current_depth)
+        if producer is None:
+            with self._lock:
+                producer = self._plans.get(key)
+                if producer is None:
+                    producer = self._plans[key] = self._compile(field_type, current_depth)
+        return producer
+
+    def _compile(self, field_type: Any, current_depth: int) -> ColumnProducer:
+        origin = get_origin(field_type)
+        args = get_args(field_type)
+
+        if origin is Union and type(None) in args:
+            return self.compile(next(a for a in args if a is not type(None)), current_depth)
+
+        if origin is Annotated:
+            if args[0] is str:
+                min_len, max_len = string_length(field_type.__metadata__)
+                if min_len > max_len:
+                    min_len = max_len = 1
+                return lambda ctx, n: _random_strings(ctx.rng, n, min_len, max_len)
+            return self.compile(args[0], current_depth)
+
+        if field_type is str:
+            return lambda ctx, n: ValuePools.choice("text", ctx.rng, n)
+        if field_type is int:
+            return lambda ctx, n: ctx.rng.integers(INT_RANGE[0], INT_RANGE[1] + 1, n).tolist()
+        if field_type is float:
+            return lambda ctx, n: ctx.rng.uniform(*FLOAT_RANGE, n).tolist()
+        if field_type is bool:
+            return lambda ctx, n: (ctx.rng.random(n) < 0.5).tolist()
+
+        if field_type is datetime:
+            return lambda ctx, n: [(ctx.now() + timedelta(days=1)).isoformat() + "Z"] * n
+        if field_type is date:
+            return lambda ctx, n: [(ctx.now() + timedelta(days=1)).date().isoformat()] * n
+
+        if field_type is UUID:
+            return lambda ctx, n: _random_uuids(ctx.rng, n)
+
+        if origin in (list, List, set, Set):
+            container = list
+            if origin in (set, Set):
+                # В dict-выводе множество - отсортированный список, чтобы результат не зависел от процесса
+                container = set if self.as_models else lambda items: _sorted_list(set(items))
+            if current_depth >= self.max_depth:
+                return lambda ctx, n: [container(()) for _ in range(n)]
+            item = self.compile(args[0], current_depth + 1)
+
+            def produce_items(ctx, n):
+                counts = ctx.rng.integers(1, 3, n).tolist()
+                return _split(item(ctx, sum(counts)), counts, container)
+            return produce_items
+
+        if origin in (dict, Dict):
+            if current_depth >= self.max_depth:
+                return lambda ctx, n: [{} for _ in range(n)]
+            value = self.compile(args[1], current_depth + 1)
+
+            def produce_dicts(ctx, n):
+                counts = ctx.rng.integers(1, 3, n).tolist()
+                total = sum(counts)
+                pairs = list(zip(ValuePools.choice("word", ctx.rng, total), value(ctx, total)))
+                return _split(pairs, counts, dict)
+            return produce_dicts
+
+        if isinstance(field_type, type):
+            if issubclass(field_type, Enum):
+                members = np.array(
+                    list(field_type) if self.as_models else [m.value for m in field_type], dtype=object
+                )
+                return lambda ctx, n: members[ctx.rng.integers(0, len(members), n)].tolist()
+
+            if issubclass(field_type, BaseModel) and not issubclass(field_type, RootModel):
+                if current_depth >= self.max_depth:
+                    return _constant(None)
+                return lambda ctx, n: self.generate(field_type, n, ctx, current_depth + 1)
+
+        return self._rows(field_type, current_depth)
+
+    def _rows(self, field_type: Any, current_depth: int) -> ColumnProducer:
+        """
+        Типы без векторного пути (Union, Any, RootModel, ForwardRef) - поштучно
+        скомпилированными планами RandomValueGenerator
+        """
+        produce = RandomValueGenerator.compile(field_type, current_depth, self.max_depth)
+        if self.as_models:
+            return lambda ctx, n: [produce(ctx) for _ in range(n)]
+        return lambda ctx, n: [_jsonable(produce(ctx)) for _ in range(n)]
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return _sorted_list(value)
+    if isinstance(value, (UUID, datetime, date)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json_bytes(records: List[Dict[str, Any]]) -> bytes:
+    return json.dumps(records, default=json_default, ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,68 @@
+import random
+from datetime import datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+import numpy as np
+from faker import Faker
+
+# Для детерминированной генерации "сейчас" фиксируется, иначе даты в данных плавают
+DEFAULT_BASE_TIME = datetime(2025, 1, 1)
+
+
+class GeneratorContext:
+    """
+    Источники случайности для генераторов данных: random.Random, Faker и NumPy Generator.
+
+    GeneratorContext(seed=42) даёт воспроизводимую последовательность значений
+    (включая UUID и даты, "сейчас" = base_time). Без seed используются
+    глобальный random, общий Faker и текущее время - как раньше.
+    Независимые потоки для воркеров - spawn()/for_shard().
+    """
+
+    def __init__(
+            self,
+            seed: Optional[int] = None,
+            base_time: Optional[datetime] = None,
+            fake: Optional[Faker] = None,
+            rng: Optional[np.random.Generator] = None,
+    ):
+        self.seed = seed
+        if seed is None:
+            self.random = random
+            self.fake = fake or Faker()
+            self.rng = rng or np.random.default_rng()
+            self.base_time = base_time
+        else:
+            self.random = random.Random(seed)
+            self.fake = fake or Faker()
+            self.fake.seed_instance(seed)
+            self.rng = rng or np.random.default_rng(seed)
+            self.base_time = base_time or DEFAULT_BASE_TIME
+
+    @classmethod
+    def from_seed_sequence(cls, sequence: np.random.SeedSequence, base_time: Optional[datetime] = None) -> "GeneratorContext":
+        seed = int(sequence.generate_state(1, dtype=np.uint64)[0])
+        return cls(seed=seed, base_time=base_time, rng=np.random.default_rng(sequence))
+
+    @classmethod
+    def for_shard(cls, seed: int, shards: int, shard: int, base_time: Optional[datetime] = None) -> "GeneratorContext":
+        """Контекст шарда: одинаковый для одинаковых (seed, shards, shard)"""
+        return cls.from_seed_sequence(np.random.SeedSequence(seed).spawn(shards)[shard], base_time)
+
+    def spawn(self, count: int) -> list:
+        """Независимые дочерние контексты (для пула потоков/процессов)"""
+        if self.seed is None:
+            return [GeneratorContext(base_time=self.base_time) for _ in range(count)]
+        return [
+            GeneratorContext.from_seed_sequence(sequence, self.base_time)
+            for sequence in np.random.SeedSequence(self.seed).spawn(count)
+        ]
+
+    def now(self) -> datetime:
+        return self.base_time or datetime.now()
+
+    def uuid4(self) -> str:
+        if self.seed is None:
+            return str(uuid4())
+        return str(UUID(int=self.random.getrandbits(128), version=4))
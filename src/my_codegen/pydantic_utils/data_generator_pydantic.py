@@ -1,24 +1,143 @@
-import random
+import threading
+from dataclasses import dataclass
 from datetime import datetime, date, timedelta
 from enum import Enum
 from typing import (
-    Any, List, Dict, Union, Set,
+    Any, Callable, List, Dict, Optional, Tuple, Union, Set,
     get_args, get_origin, ForwardRef, Annotated
 )
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from faker import Faker
 
+from my_codegen.pydantic_utils.context import GeneratorContext
 from my_codegen.pydantic_utils.pydantic_config import BaseConfigModel
 
-from pydantic import Field, StringConstraints, RootModel, BaseModel
+from pydantic import RootModel, BaseModel
+from pydantic.fields import FieldInfo
 
 fake = Faker()
+default_context = GeneratorContext(fake=fake)
+
+
+Producer = Callable[[GeneratorContext], Any]
+
+# Диапазоны значений по умолчанию - общие для RandomValueGenerator, BatchGenerator и SchemaDataGenerator
+INT_RANGE = (1, 1000)
+FLOAT_RANGE = (1.0, 100.0)
+TEXT_MAX_CHARS = 20
+
+
+def string_length(metadata: tuple) -> Tuple[int, int]:
+    """(min_length, max_length) строки из метаданных Annotated, по умолчанию 1..TEXT_MAX_CHARS"""
+    min_len = 1
+    max_len = TEXT_MAX_CHARS
+    # Field(...) хранит ограничения в metadata (annotated_types.MinLen/MaxLen)
+    constraints = []
+    for meta in metadata:
+        constraints.extend(meta.metadata if isinstance(meta, FieldInfo) else (meta,))
+    for meta in constraints:
+        if getattr(meta, "min_length", None) is not None:
+            min_len = meta.min_length
+        if getattr(meta, "max_length", None) is not None:
+            max_len = meta.max_length
+    return min_len, max_len
+
+
+def _constant(value: Any) -> Producer:
+    return lambda ctx: value
+
+
+def _unsupported(field_type: Any) -> Producer:
+    def produce(ctx):
+        raise ValueError(f"Unsupported field type: {field_type}")
+    return produce
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    name: str
+    is_optional: bool
+    produce: Producer
+
+
+@dataclass(frozen=True)
+class ModelPlan:
+    model_class: type
+    fields: Tuple[FieldPlan, ...]
+
+    def build(self, ctx: GeneratorContext) -> Any:
+        return self.model_class.model_construct(**{f.name: f.produce(ctx) for f in self.fields})
 
 
 class RandomValueGenerator:
+    """
+    Тип поля компилируется один раз в дерево генераторов значений (Producer),
+    разбор аннотаций (get_origin/get_args, проверки типов) при генерации
+    экземпляров не повторяется. Планы кэшируются по (тип, глубина, max_depth).
+    """
+
+    _plans: Dict[Tuple[Any, int, int], Producer] = {}
+    _model_plans: Dict[Tuple[type, int, int], ModelPlan] = {}
+    _lock = threading.RLock()
+
     @staticmethod
-    def random_value(field_type: Any, current_depth: int = 0, max_depth: int = 3) -> Any:
+    def random_value(
+            field_type: Any,
+            current_depth: int = 0,
+            max_depth: int = 3,
+            context: Optional[GeneratorContext] = None,
+    ) -> Any:
+        producer = RandomValueGenerator.compile(field_type, current_depth, max_depth)
+        return producer(context or default_context)
+
+    @classmethod
+    def compile(cls, field_type: Any, current_depth: int = 0, max_depth: int = 3) -> Producer:
+        key = (field_type, current_depth, max_depth)
+        try:
+            producer = cls._plans.get(key)
+        except TypeError:
+            # Нехэшируемые метаданные в Annotated - компилируем без кэша
+            return cls._compile(field_type, current_depth, max_depth)
+        if producer is None:
+            with cls._lock:
+                producer = cls._plans.get(key)
+                if producer is None:
+                    producer = cls._plans[key] = cls._compile(field_type, current_depth, max_depth)
+        return producer
+
+    @classmethod
+    def model_plan(cls, model_class: type, current_depth: int = 0, max_depth: int = 3) -> ModelPlan:
+        key = (model_class, current_depth, max_depth)
+        plan = cls._model_plans.get(key)
+        if plan is None:
+            with cls._lock:
+                plan = cls._model_plans.get(key)
+                if plan is None:
+                    plan = cls._model_plans[key] = cls._compile_model(model_class, current_depth, max_depth)
+        return plan
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        with cls._lock:
+            cls._plans.clear()
+            cls._model_plans.clear()
+
+    @classmethod
+    def _compile_model(cls, model_class: type, current_depth: int, max_depth: int) -> ModelPlan:
+        fields = []
+        for field_name, field_info in model_class.model_fields.items():
+            annotation = field_info.annotation
+            args = get_args(annotation)
+            is_optional = get_origin(annotation) is Union and type(None) in args
+
+            # Если Optional[...] -> достаём реальный тип
+            real_type = next(a for a in args if a is not type(None)) if is_optional else annotation
+            fields.append(FieldPlan(field_name, is_optional, cls.compile(real_type, current_depth, max_depth)))
+        return ModelPlan(model_class, tuple(fields))
+
+    @classmethod
+    def _compile(cls, field_type: Any, current_depth: int, max_depth: int) -> Producer:
         origin = get_origin(field_type)
         args = get_args(field_type)
 
@@ -26,115 +145,101 @@ class RandomValueGenerator:
         if origin is Union and type(None) in args:
             for arg in args:
                 if arg is not type(None):
-                    return RandomValueGenerator.random_value(arg, current_depth, max_depth)
+                    return cls.compile(arg, current_depth, max_depth)
 
         # 2) Union (без None)
         if origin is Union:
-            chosen = random.choice(args)
-            return RandomValueGenerator.random_value(chosen, current_depth, max_depth)
+            producers = [cls.compile(arg, current_depth, max_depth) for arg in args]
+            return lambda ctx: ctx.random.choice(producers)(ctx)
 
         # 3) Annotated
-        # Проверяем, что это действительно Annotated (или "AnnotatedValue")
-        if origin is Annotated or "AnnotatedValue" in str(origin) or "Annotated" in str(origin):
+        if origin is Annotated:
             base_type = args[0] if args else str
-            metadata = args[1:] if len(args) > 1 else ()
-            return RandomValueGenerator._handle_annotated(
-                base_type, metadata, current_depth, max_depth
-            )
+            metadata = field_type.__metadata__
+            return cls._compile_annotated(base_type, metadata, current_depth, max_depth)
 
         # 4) Any
         if field_type is Any:
-            return random.choice([fake.word(), random.randint(1, 1000), random.uniform(1.0, 100.0)])
+            return lambda ctx: ctx.random.choice(
+                [ctx.fake.word(), ctx.random.randint(*INT_RANGE), ctx.random.uniform(*FLOAT_RANGE)]
+            )
 
         # 5) Примитивы
         if field_type is str:
-            return fake.text(max_nb_chars=20)
+            return lambda ctx: ctx.fake.text(max_nb_chars=TEXT_MAX_CHARS)
         if field_type is int:
-            return random.randint(1, 1000)
+            return lambda ctx: ctx.random.randint(*INT_RANGE)
         if field_type is float:
-            return random.uniform(1.0, 100.0)
+            return lambda ctx: ctx.random.uniform(*FLOAT_RANGE)
         if field_type is bool:
-            return random.choice([True, False])
+            return lambda ctx: ctx.random.choice([True, False])
 
         # 6) datetime/date
         if field_type is datetime:
-            return (datetime.now() + timedelta(days=1)).isoformat() + "Z"
+            return lambda ctx: (ctx.now() + timedelta(days=1)).isoformat() + "Z"
         if field_type is date:
-            return (datetime.now() + timedelta(days=1)).date().isoformat()
+            return lambda ctx: (ctx.now() + timedelta(days=1)).date().isoformat()
 
         # 7) UUID
         if field_type is UUID:
-            return str(uuid4())
+            return lambda ctx: ctx.uuid4()
 
         # 8) Контейнеры (List, Dict, Set и т.д.)
         if origin in (list, List):
             if current_depth >= max_depth:
-                return []
-            return [
-                RandomValueGenerator.random_value(args[0], current_depth + 1, max_depth)
-                for _ in range(random.randint(1, 2))
-            ]
+                return lambda ctx: []
+            item = cls.compile(args[0], current_depth + 1, max_depth)
+            return lambda ctx: [item(ctx) for _ in range(ctx.random.randint(1, 2))]
         if origin in (dict, Dict):
             if current_depth >= max_depth:
-                return {}
-            return {
-                fake.word(): RandomValueGenerator.random_value(args[1], current_depth + 1, max_depth)
-                for _ in range(random.randint(1, 2))
-            }
+                return lambda ctx: {}
+            value = cls.compile(args[1], current_depth + 1, max_depth)
+            return lambda ctx: {ctx.fake.word(): value(ctx) for _ in range(ctx.random.randint(1, 2))}
         if origin in (set, Set):
             if current_depth >= max_depth:
-                return set()
-            return {
-                RandomValueGenerator.random_value(args[0], current_depth + 1, max_depth)
-                for _ in range(random.randint(1, 2))
-            }
-
-        # 9) Enum
-        if isinstance(field_type, type) and issubclass(field_type, Enum):
-            return random.choice(list(field_type))
-
-        # 9.1) Если это Pydantic RootModel
-        if isinstance(field_type, type) and issubclass(field_type, RootModel):
-            root_annotation = field_type.model_fields["root"].annotation
-            generated = RandomValueGenerator.random_value(root_annotation, current_depth, max_depth)
-            return field_type.model_construct(root=generated, _fields_set={"root"})
-
-        # 10) Обрабатываем Pydantic-модель (ваш BaseConfigModel или BaseModel)
-        if isinstance(field_type, type) and (issubclass(field_type, BaseConfigModel) or issubclass(field_type, BaseModel)):
-            if current_depth >= max_depth:
-                return None
-            from_data = GenerateData(field_type, current_depth + 1, max_depth)
-            return from_data.fill_all_fields().build()
+                return lambda ctx: set()
+            item = cls.compile(args[0], current_depth + 1, max_depth)
+            return lambda ctx: {item(ctx) for _ in range(ctx.random.randint(1, 2))}
+
+        if isinstance(field_type, type):
+            # 9) Enum
+            if issubclass(field_type, Enum):
+                members = list(field_type)
+                return lambda ctx: ctx.random.choice(members)
+
+            # 9.1) Если это Pydantic RootModel
+            if issubclass(field_type, RootModel):
+                root = cls.compile(field_type.model_fields["root"].annotation, current_depth, max_depth)
+                return lambda ctx: field_type.model_construct(root=root(ctx), _fields_set={"root"})
+
+            # 10) Обрабатываем Pydantic-модель (ваш BaseConfigModel или BaseModel)
+            if issubclass(field_type, BaseModel):
+                if current_depth >= max_depth:
+                    return _constant(None)
+                # План вложенной модели собирается при первом вызове:
+                # так рекурсивные модели не зацикливают компиляцию
+                plan_key = (field_type, current_depth + 1, max_depth)
+                return lambda ctx: cls.model_plan(*plan_key).build(ctx)
 
         # 11) ForwardRef
         if isinstance(field_type, ForwardRef):
-            return []
+            return lambda ctx: []
 
         # 12) Ничего не подошло
-        raise ValueError(f"Unsupported field type: {field_type}")
+        return _unsupported(field_type)
 
-    @staticmethod
-    def _handle_annotated(base_type: Any, metadata: tuple, current_depth: int, max_depth: int) -> Any:
+    @classmethod
+    def _compile_annotated(cls, base_type: Any, metadata: tuple, current_depth: int, max_depth: int) -> Producer:
         if base_type is str:
-            min_len = 1
-            max_len = 20
-            for meta in metadata:
-                if isinstance(meta, Field):
-                    if meta.min_length is not None:
-                        min_len = meta.min_length
-                    if meta.max_length is not None:
-                        max_len = meta.max_length
-                elif isinstance(meta, StringConstraints):
-                    if meta.min_length is not None:
-                        min_len = meta.min_length
-                    if meta.max_length is not None:
-                        max_len = meta.max_length
-
-            length = random.randint(min_len, max_len) if min_len <= max_len else 1
-            return fake.pystr(min_chars=length, max_chars=length)
+            min_len, max_len = string_length(metadata)
+
+            def produce(ctx):
+                length = ctx.random.randint(min_len, max_len) if min_len <= max_len else 1
+                return ctx.fake.pystr(min_chars=length, max_chars=length)
+            return produce
 
         # Если это Annotated[int], Annotated[float] и т.д., используем общую логику
-        return RandomValueGenerator.random_value(base_type, current_depth, max_depth)
+        return cls.compile(base_type, current_depth, max_depth)
 
 
 class GenerateData:
@@ -143,8 +248,10 @@ class GenerateData:
             model_class: type[BaseConfigModel],
             current_depth: int = 0,
             max_depth: int = 3,
+            context: Optional[GeneratorContext] = None,
     ):
         self.model_class = model_class
+        self.context = context or default_context
         self.data = {}
         self.current_depth = current_depth
         self.max_depth = max_depth
@@ -153,38 +260,20 @@ class GenerateData:
         """
         Заполняет поля модели (обязательные/опциональные).
         """
-        fields = self.model_class.model_fields
+        plan = RandomValueGenerator.model_plan(self.model_class, self.current_depth, self.max_depth)
 
-        for field_name, field_info in fields.items():
+        for field in plan.fields:
             # Если поле уже заполнено вручную — пропускаем
-            if field_name in self.data:
+            if field.name in self.data:
                 continue
 
-            annotation = field_info.annotation
-            origin = get_origin(annotation)
-            args = get_args(annotation)
-
-            is_union = (origin is Union)
-            is_optional = is_union and (type(None) in args)
-
             # Пропускаем, если не соответствует режиму (только обязательные / только опциональные)
-            if required_only and is_optional:
+            if required_only and field.is_optional:
                 continue
-            if optional_only and not is_optional:
+            if optional_only and not field.is_optional:
                 continue
 
-            # Если Optional[...] -> достаём реальный тип
-            if is_optional:
-                real_type = next(a for a in args if a is not type(None))
-            else:
-                real_type = annotation
-
-            # Генерируем значение
-            self.data[field_name] = RandomValueGenerator.random_value(
-                real_type,
-                current_depth=self.current_depth,
-                max_depth=self.max_depth,
-            )
+            self.data[field.name] = field.produce(self.context)
 
     def fill_all_fields(self, **data):
         self.data.update(data)
@@ -205,29 +294,42 @@ class GenerateData:
         self.data.update(kwargs)
         return self
 
+    def batch(self, n: int, output: str = "model", required_only: bool = False, seed: Optional[int] = None):
+        """
+        Генерирует сразу n записей через BatchGenerator (пулы значений и NumPy RNG).
+        Поля, заданные через set_field/fill_*, одинаковы во всех записях.
+
+        output: "model" - экземпляры модели, "dict" - List[dict], "json" - JSON-массив в bytes.
+        """
+        from my_codegen.pydantic_utils.batch import BatchGenerator, to_json_bytes
+
+        if output not in ("model", "dict", "json"):
+            raise ValueError(f"Unknown output: {output}")
+        generator = BatchGenerator(max_depth=self.max_depth, as_models=output == "model")
+        records = generator.generate(
+            self.model_class,
+            n,
+            context=GeneratorContext(seed, self.context.base_time) if seed is not None else self.context,
+            current_depth=self.current_depth,
+            fixed=self.data,
+            required_only=required_only,
+        )
+        return to_json_bytes(records) if output == "json" else records
+
     def build(self):
         """
         Создаёт модель pydantic v2 без валидации (аналогично старому .construct).
         """
         return self.model_class.model_construct(_validate=False, **self.data)
 
-    def to_dict(self):
+    def to_dict(self) -> Dict[str, Any]:
         """
-        Рекурсивно приводит итоговый объект (BaseConfigModel) к словарю.
+        Приводит итоговый объект к словарю с JSON-совместимыми значениями
+        (enum -> value, UUID/datetime -> str, RootModel -> root) за один проход
+        сериализатора pydantic-core.
         """
-        return self._convert_to_dict(self.build())
-
-    def _convert_to_dict(self, instance: BaseConfigModel):
-        if isinstance(instance, BaseConfigModel):
-            result = {}
-            for k, v in instance.__dict__.items():
-                if isinstance(v, BaseConfigModel):
-                    result[k] = self._convert_to_dict(v)
-                elif isinstance(v, list):
-                    result[k] = [self._convert_to_dict(i) for i in v]
-                elif isinstance(v, dict):
-                    result[k] = {kk: self._convert_to_dict(vv) for kk, vv in v.items()}
-                else:
-                    result[k] = v
-            return result
-        return instance
+        return self.model_class.__pydantic_serializer__.to_python(self.build(), mode="json", warnings=False)
+
+    def to_json_bytes(self) -> bytes:
+        """JSON итогового объекта сразу в bytes, без промежуточного dict"""
+        return self.model_class.__pydantic_serializer__.to_json(self.build(), warnings=False)
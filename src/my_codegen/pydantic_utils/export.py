@@ -0,0 +1,161 @@
+import argparse
+import gzip
+import importlib
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from my_codegen.pydantic_utils.batch import BatchGenerator, json_default
+from my_codegen.pydantic_utils.context import GeneratorContext
+from my_codegen.utils.logger import configure_logging, logger
+
+FORMATS = ("ndjson", "json")
+
+
+@dataclass
+class ExportProgress:
+    records: int
+    total: int
+    bytes_written: int
+    elapsed: float
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_written / self.elapsed if self.elapsed else 0.0
+
+
+class DatasetExporter:
+    """
+    Потоковая выгрузка сгенерированных записей в NDJSON или JSON-массив.
+    Записи генерируются пачками по chunk_size (BatchGenerator, сразу dict
+    без моделей), сериализуются и пишутся в файл/поток, поэтому память
+    ограничена одной пачкой. Файл с суффиксом .gz сжимается gzip.
+    Путь "-" - stdout.
+    """
+
+    def __init__(
+            self,
+            model_class: type,
+            output: str,
+            fmt: str = "ndjson",
+            chunk_size: int = 10_000,
+            compress: Optional[bool] = None,
+            compresslevel: int = 5,
+            max_depth: int = 3,
+            required_only: bool = False,
+            context: Optional[GeneratorContext] = None,
+            on_progress: Optional[Callable[[ExportProgress], None]] = None,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format: {fmt}")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.model_class = model_class
+        self.output = output
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+        self.compress = output.endswith(".gz") if compress is None else compress
+        self.compresslevel = compresslevel
+        self.required_only = required_only
+        self.context = context
+        self.on_progress = on_progress or self._log_progress
+        self._generator = BatchGenerator(max_depth=max_depth, as_models=False)
+        self._encoder = json.JSONEncoder(default=json_default, ensure_ascii=False, separators=(",", ":"))
+
+    def _open(self) -> IO[bytes]:
+        if self.output == "-":
+            stream = sys.stdout.buffer
+            return gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=self.compresslevel) if self.compress else stream
+        if self.compress:
+            return gzip.open(self.output, "wb", compresslevel=self.compresslevel)
+        return open(self.output, "wb")
+
+    def _encode(self, records: List[Dict[str, Any]], first: bool) -> bytes:
+        encode = self._encoder.encode
+        if self.fmt == "ndjson":
+            return "".join(encode(record) + "\n" for record in records).encode("utf-8")
+        body = ",".join(encode(record) for record in records)
+        return (body if first else "," + body).encode("utf-8")
+
+    def export(self, total: int) -> ExportProgress:
+        started = time.perf_counter()
+        progress = ExportProgress(records=0, total=total, bytes_written=0, elapsed=0.0)
+        stream = self._open()
+        try:
+            if self.fmt == "json":
+                progress.bytes_written += stream.write(b"[")
+            while progress.records < total:
+                size = min(self.chunk_size, total - progress.records)
+                records = self._generator.generate(
+                    self.model_class, size, context=self.context, required_only=self.required_only
+                )
+                progress.bytes_written += stream.write(self._encode(records, first=progress.records == 0))
+                progress.records += size
+                progress.elapsed = time.perf_counter() - started
+                self.on_progress(progress)
+            if self.fmt == "json":
+                progress.bytes_written += stream.write(b"]\n")
+        finally:
+            if stream is not sys.stdout.buffer:
+                # GzipFile поверх stdout при close() дописывает хвост, но сам stdout не сбрасывает
+                stream.close()
+            if self.output == "-":
+                sys.stdout.buffer.flush()
+        progress.elapsed = time.perf_counter() - started
+        logger.info(
+            "Exported %d records (%d bytes uncompressed) in %.2fs: %.0f records/s, %.2f MiB/s",
+            progress.records, progress.bytes_written, progress.elapsed,
+            progress.records_per_second, progress.bytes_per_second / 1024 / 1024,
+        )
+        return progress
+
+    @staticmethod
+    def _log_progress(progress: ExportProgress) -> None:
+        logger.info(
+            "Export progress: %d/%d records, %.0f records/s",
+            progress.records, progress.total, progress.records_per_second,
+        )
+
+
+def _load_model(spec: str) -> type:
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError("Model must be given as 'package.module:ClassName'")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def main():
+    configure_logging(stream=sys.stderr)
+    parser = argparse.ArgumentParser(description="Stream generated records as NDJSON/JSON")
+    parser.add_argument("model", help="Model as 'package.module:ClassName'")
+    parser.add_argument("-n", "--count", type=int, required=True, help="Number of records")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('.gz' - gzip), '-' for stdout")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--gzip", action="store_true", help="Compress output even without '.gz' suffix")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--required-only", action="store_true")
+    args = parser.parse_args()
+
+    exporter = DatasetExporter(
+        _load_model(args.model),
+        args.output,
+        fmt=args.format,
+        chunk_size=args.chunk_size,
+        compress=True if args.gzip else None,
+        max_depth=args.max_depth,
+        required_only=args.required_only,
+        context=GeneratorContext(seed=args.seed) if args.seed is not None else None,
+    )
+    exporter.export(args.count)
+
+
+if __name__ == "__main__":
+    main()
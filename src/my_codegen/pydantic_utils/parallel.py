@@ -0,0 +1,57 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from my_codegen.pydantic_utils.context import GeneratorContext
+from my_codegen.pydantic_utils.data_generator_pydantic import GenerateData
+
+
+def shard_sizes(total: int, shards: int) -> List[int]:
+    base, rest = divmod(total, shards)
+    return [base + (1 if shard < rest else 0) for shard in range(shards)]
+
+
+def _generate_shard(task: Tuple) -> Any:
+    model_class, size, seed, shards, shard, output, max_depth, required_only, base_time = task
+    context = GeneratorContext.for_shard(seed, shards, shard, base_time)
+    return GenerateData(model_class, max_depth=max_depth, context=context).batch(
+        size, output=output, required_only=required_only
+    )
+
+
+def generate_sharded(
+        model_class: type,
+        total: int,
+        seed: int,
+        shards: Optional[int] = None,
+        processes: Optional[int] = None,
+        output: str = "dict",
+        max_depth: int = 3,
+        required_only: bool = False,
+        base_time: Optional[datetime] = None,
+) -> Any:
+    """
+    Генерирует total записей в shards шардов параллельно в процессах.
+    У каждого шарда свой поток случайности из SeedSequence(seed), поэтому
+    результат зависит только от (seed, shards), но не от числа процессов.
+    Модель должна импортироваться по имени (объявлена на уровне модуля).
+
+    output: "dict"/"model" - общий список записей, "json" - один JSON-массив в bytes.
+    В "dict" и "json" множества - отсортированные списки: порядок обхода set
+    зависит от PYTHONHASHSEED процесса, и без сортировки вывод не повторялся бы.
+    """
+    shards = shards or os.cpu_count() or 1
+    tasks = [
+        (model_class, size, seed, shards, shard, output, max_depth, required_only, base_time)
+        for shard, size in enumerate(shard_sizes(total, shards))
+    ]
+    if processes == 1:
+        results = [_generate_shard(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_generate_shard, tasks))
+
+    if output == "json":
+        return b"[" + b",".join(chunk[1:-1] for chunk in results if len(chunk) > 2) + b"]"
+    return [record for chunk in results for record in chunk]
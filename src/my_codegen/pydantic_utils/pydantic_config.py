@@ -1,8 +1,23 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class BaseConfigModel(BaseModel):
-    class Config:
-        extra = 'forbid'
-        use_enum_values = True
-        validate_assignment = True
+    model_config = ConfigDict(
+        extra='forbid',
+        use_enum_values=True,
+        validate_assignment=True,
+    )
+
+
+class BaseResponseModel(BaseModel):
+    """
+    База для моделей, которые встречаются только в ответах: неизменяемые,
+    без валидации при присваивании. __slots__ для полей pydantic не поддерживает,
+    поэтому значения по-прежнему хранятся в __dict__.
+    """
+
+    model_config = ConfigDict(
+        extra='forbid',
+        use_enum_values=True,
+        frozen=True,
+    )
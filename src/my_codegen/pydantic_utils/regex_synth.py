@@ -0,0 +1,125 @@
+import re
+import string
+from typing import Any, Callable, Dict, List
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_constants
+    import sre_parse
+
+from my_codegen.pydantic_utils.context import GeneratorContext
+
+# Повторы без верхней границы ("*", "+", "{2,}") ограничиваются min + UNBOUNDED_EXTRA
+UNBOUNDED_EXTRA = 8
+_PRINTABLE = string.ascii_letters + string.digits + "-_."
+
+_CATEGORIES: Dict[Any, str] = {
+    sre_constants.CATEGORY_DIGIT: string.digits,
+    sre_constants.CATEGORY_NOT_DIGIT: string.ascii_letters + "-_.",
+    sre_constants.CATEGORY_WORD: string.ascii_letters + string.digits + "_",
+    sre_constants.CATEGORY_NOT_WORD: " -.,:;!?",
+    sre_constants.CATEGORY_SPACE: " ",
+    sre_constants.CATEGORY_NOT_SPACE: _PRINTABLE,
+}
+
+# (контекст, захваченные группы) -> фрагмент строки
+Part = Callable[[GeneratorContext, Dict[int, str]], str]
+
+
+class RegexSynthesizer:
+    """
+    Генерирует строки, которые соответствуют регулярному выражению.
+    Шаблон разбирается sre_parse один раз и компилируется в дерево генераторов
+    фрагментов; якоря (^, $, \\b) и lookaround пропускаются - вызывающий код
+    проверяет результат по исходному шаблону (matches).
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self._regex = re.compile(pattern)
+        self._parts = self._compile(sre_parse.parse(pattern))
+
+    def generate(self, ctx: GeneratorContext) -> str:
+        groups: Dict[int, str] = {}
+        return "".join(part(ctx, groups) for part in self._parts)
+
+    def matches(self, value: str) -> bool:
+        """pattern в JSON Schema не привязан к началу/концу строки - как re.search"""
+        return self._regex.search(value) is not None
+
+    def _compile(self, parsed) -> List[Part]:
+        return [self._compile_node(op, av) for op, av in parsed]
+
+    def _compile_node(self, op, av) -> Part:
+        if op is sre_constants.LITERAL:
+            char = chr(av)
+            return lambda ctx, groups: char
+        if op is sre_constants.NOT_LITERAL:
+            alphabet = _PRINTABLE.replace(chr(av), "")
+            return lambda ctx, groups: ctx.random.choice(alphabet)
+        if op is sre_constants.ANY:
+            return lambda ctx, groups: ctx.random.choice(_PRINTABLE)
+        if op is sre_constants.IN:
+            alphabet = self._charset(av)
+            return lambda ctx, groups: ctx.random.choice(alphabet)
+        if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            return lambda ctx, groups: ""
+        if op is sre_constants.BRANCH:
+            branches = [self._compile(branch) for branch in av[1]]
+            return lambda ctx, groups: self._join(ctx.random.choice(branches), ctx, groups)
+        if op is sre_constants.SUBPATTERN:
+            group, parsed = av[0], av[-1]
+            parts = self._compile(parsed)
+
+            def subpattern(ctx, groups):
+                value = self._join(parts, ctx, groups)
+                if group is not None:
+                    groups[group] = value
+                return value
+            return subpattern
+        if op is sre_constants.GROUPREF:
+            return lambda ctx, groups: groups.get(av, "")
+        if op is sre_constants.GROUPREF_EXISTS:
+            group, yes, no = av
+            yes_parts, no_parts = self._compile(yes), self._compile(no or [])
+            return lambda ctx, groups: self._join(yes_parts if group in groups else no_parts, ctx, groups)
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, getattr(sre_constants, "POSSESSIVE_REPEAT", None)):
+            low, high, parsed = av
+            if high is sre_constants.MAXREPEAT:
+                high = low + UNBOUNDED_EXTRA
+            parts = self._compile(parsed)
+            return lambda ctx, groups: "".join(
+                self._join(parts, ctx, groups) for _ in range(ctx.random.randint(low, high))
+            )
+        if op is getattr(sre_constants, "ATOMIC_GROUP", None):
+            parts = self._compile(av)
+            return lambda ctx, groups: self._join(parts, ctx, groups)
+        raise ValueError(f"Unsupported regex construct {op} in pattern {self.pattern!r}")
+
+    @staticmethod
+    def _join(parts: List[Part], ctx: GeneratorContext, groups: Dict[int, str]) -> str:
+        return "".join(part(ctx, groups) for part in parts)
+
+    @staticmethod
+    def _charset(items) -> str:
+        chars: List[str] = []
+        negate = False
+        for op, av in items:
+            if op is sre_constants.NEGATE:
+                negate = True
+            elif op is sre_constants.LITERAL:
+                chars.append(chr(av))
+            elif op is sre_constants.RANGE:
+                low, high = av
+                chars.extend(chr(code) for code in range(low, min(high, low + 255) + 1))
+            elif op is sre_constants.CATEGORY:
+                chars.extend(_CATEGORIES.get(av, ""))
+        if negate:
+            excluded = set(chars)
+            chars = [char for char in _PRINTABLE if char not in excluded]
+        alphabet = "".join(dict.fromkeys(chars))
+        if not alphabet:
+            raise ValueError("Empty character set")
+        return alphabet
+
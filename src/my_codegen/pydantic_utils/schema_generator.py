@@ -0,0 +1,354 @@
+import base64
+import json
+import math
+import re
+import threading
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from my_codegen.pydantic_utils.context import GeneratorContext
+from my_codegen.pydantic_utils.data_generator_pydantic import FLOAT_RANGE, INT_RANGE, TEXT_MAX_CHARS, default_context
+from my_codegen.pydantic_utils.regex_synth import RegexSynthesizer
+from my_codegen.utils.logger import logger
+
+Producer = Callable[[GeneratorContext], Any]
+
+# Сколько раз перегенерировать строку по pattern, если она не укладывается в minLength/maxLength
+PATTERN_ATTEMPTS = 20
+
+_FORMATS: Dict[str, Producer] = {
+    "email": lambda ctx: ctx.fake.email(),
+    "idn-email": lambda ctx: ctx.fake.email(),
+    "uri": lambda ctx: ctx.fake.url(),
+    "url": lambda ctx: ctx.fake.url(),
+    "uri-reference": lambda ctx: "/" + ctx.fake.uri_path(),
+    "hostname": lambda ctx: ctx.fake.domain_name(),
+    "ipv4": lambda ctx: ctx.fake.ipv4(),
+    "ipv6": lambda ctx: ctx.fake.ipv6(),
+    "uuid": lambda ctx: ctx.uuid4(),
+    "date-time": lambda ctx: (ctx.now() + timedelta(days=1)).isoformat() + "Z",
+    "date": lambda ctx: (ctx.now() + timedelta(days=1)).date().isoformat(),
+    "time": lambda ctx: ctx.now().time().replace(microsecond=0).isoformat(),
+    "byte": lambda ctx: base64.b64encode(ctx.fake.binary(length=12)).decode("ascii"),
+    "password": lambda ctx: ctx.fake.password(),
+    "phone": lambda ctx: ctx.fake.phone_number(),
+}
+
+
+class SchemaDataGenerator:
+    """
+    Генератор данных по components/schemas спецификации OpenAPI.
+
+    Каждая схема компилируется один раз в дерево генераторов с учётом
+    ограничений: pattern (RegexSynthesizer), format, minLength/maxLength,
+    minimum/maximum/exclusive*/multipleOf, enum/const, minItems/maxItems/uniqueItems,
+    required, $ref, allOf/oneOf/anyOf, additionalProperties. Результат - JSON-совместимые
+    dict, которые проходят серверную валидацию по той же схеме.
+    """
+
+    def __init__(
+            self,
+            spec: Dict[str, Any],
+            max_depth: int = 3,
+            required_only: bool = False,
+            context: Optional[GeneratorContext] = None,
+    ):
+        self.spec = spec
+        self.schemas: Dict[str, Any] = spec.get("components", {}).get("schemas", {}) or spec.get("definitions", {})
+        self.max_depth = max_depth
+        self.required_only = required_only
+        self.context = context or default_context
+        self._plans: Dict[Tuple[str, int], Producer] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "SchemaDataGenerator":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def generate(self, schema_name: str, context: Optional[GeneratorContext] = None, **overrides) -> Any:
+        value = self.producer(schema_name)(context or self.context)
+        if overrides and isinstance(value, dict):
+            value.update(overrides)
+        return value
+
+    def batch(self, schema_name: str, n: int, context: Optional[GeneratorContext] = None) -> List[Any]:
+        produce = self.producer(schema_name)
+        ctx = context or self.context
+        return [produce(ctx) for _ in range(n)]
+
+    def producer(self, schema_name: str, depth: int = 0) -> Producer:
+        key = (schema_name, depth)
+        plan = self._plans.get(key)
+        if plan is None:
+            with self._lock:
+                plan = self._plans.get(key)
+                if plan is None:
+                    if schema_name not in self.schemas:
+                        raise KeyError(f"Schema '{schema_name}' not found in components/schemas")
+                    plan = self._plans[key] = self.compile(self.schemas[schema_name], depth)
+        return plan
+
+    # -- компиляция --
+    def _resolve(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        while "$ref" in schema:
+            schema = self.schemas[self._ref_name(schema["$ref"])]
+        return schema
+
+    @staticmethod
+    def _ref_name(ref: str) -> str:
+        return ref.rsplit("/", 1)[-1]
+
+    def compile(self, schema: Dict[str, Any], depth: int = 0) -> Producer:
+        if "$ref" in schema:
+            name = self._ref_name(schema["$ref"])
+            if depth >= self.max_depth:
+                return self._minimal(schema)
+            # План собирается при первом вызове: так рекурсивные схемы не зацикливают компиляцию
+            return lambda ctx: self.producer(name, depth + 1)(ctx)
+
+        if "const" in schema:
+            value = schema["const"]
+            return lambda ctx: value
+        if schema.get("enum"):
+            values = [v for v in schema["enum"] if v is not None] or schema["enum"]
+            return lambda ctx: ctx.random.choice(values)
+
+        if "allOf" in schema:
+            return self.compile(self._merge_all_of(schema), depth)
+        for key in ("oneOf", "anyOf"):
+            if key in schema:
+                return self._compile_variants(schema, schema[key], depth)
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            schema_type = next((t for t in schema_type if t != "null"), None)
+        if schema_type is None:
+            if "properties" in schema or "additionalProperties" in schema:
+                schema_type = "object"
+            elif "items" in schema:
+                schema_type = "array"
+
+        if schema_type == "object":
+            return self._compile_object(schema, depth)
+        if schema_type == "array":
+            return self._compile_array(schema, depth)
+        if schema_type == "string":
+            return self._compile_string(schema)
+        if schema_type == "integer":
+            return self._compile_number(schema, integer=True)
+        if schema_type == "number":
+            return self._compile_number(schema, integer=False)
+        if schema_type == "boolean":
+            return lambda ctx: ctx.random.choice([True, False])
+        return lambda ctx: ctx.fake.word()
+
+    def _merge_all_of(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        merged: Dict[str, Any] = {k: v for k, v in schema.items() if k != "allOf"}
+        properties = dict(merged.get("properties", {}))
+        required = list(merged.get("required", []))
+        for part in schema["allOf"]:
+            part = self._resolve(part)
+            if "allOf" in part:
+                part = self._merge_all_of(part)
+            for key, value in part.items():
+                if key == "properties":
+                    properties.update(value)
+                elif key == "required":
+                    required.extend(r for r in value if r not in required)
+                else:
+                    merged.setdefault(key, value)
+        if properties:
+            merged["properties"] = properties
+            merged.setdefault("type", "object")
+        if required:
+            merged["required"] = required
+        return merged
+
+    def _compile_variants(self, schema: Dict[str, Any], variants: List[Dict[str, Any]], depth: int) -> Producer:
+        rest = {k: v for k, v in schema.items() if k not in ("oneOf", "anyOf", "discriminator")}
+        compiled = []
+        discriminator = schema.get("discriminator") or {}
+        property_name = discriminator.get("propertyName")
+        mapping = {self._ref_name(ref): key for key, ref in (discriminator.get("mapping") or {}).items()}
+        for variant in variants:
+            # Тег берётся по $ref исходного варианта: после слияния с общими полями его уже нет
+            tag = mapping.get(self._ref_name(variant["$ref"])) if "$ref" in variant else None
+            if property_name and tag is None and "$ref" in variant:
+                tag = self._ref_name(variant["$ref"])
+            if rest.get("properties") or rest.get("required"):
+                variant = self._merge_all_of({"allOf": [rest, variant]})
+            compiled.append((self.compile(variant, depth), tag))
+
+        def produce(ctx):
+            variant, tag = ctx.random.choice(compiled)
+            value = variant(ctx)
+            if property_name and tag is not None and isinstance(value, dict):
+                value[property_name] = tag
+            return value
+        return produce
+
+    def _compile_object(self, schema: Dict[str, Any], depth: int) -> Producer:
+        required = set(schema.get("required", []))
+        properties = [
+            (name, self.compile(prop, depth))
+            for name, prop in schema.get("properties", {}).items()
+            if not prop.get("readOnly") and (name in required or not self.required_only)
+        ]
+        additional = schema.get("additionalProperties")
+        if properties or not isinstance(additional, dict):
+            return lambda ctx: {name: produce(ctx) for name, produce in properties}
+
+        value = self.compile(additional, depth + 1)
+        min_props = schema.get("minProperties", 1)
+        max_props = max(min_props, schema.get("maxProperties", 2))
+
+        def produce_map(ctx):
+            result = {}
+            target = ctx.random.randint(min_props, max_props)
+            while len(result) < target:
+                result[ctx.fake.word() + str(len(result))] = value(ctx)
+            return result
+        return produce_map
+
+    def _compile_array(self, schema: Dict[str, Any], depth: int) -> Producer:
+        min_items = schema.get("minItems", 1 if depth < self.max_depth else 0)
+        max_items = max(min_items, schema.get("maxItems", max(min_items, 2)))
+        if depth >= self.max_depth and min_items == 0:
+            return lambda ctx: []
+        item = self.compile(schema.get("items", {}), depth + 1)
+        unique = schema.get("uniqueItems", False)
+
+        def produce(ctx):
+            count = ctx.random.randint(min_items, max_items)
+            if not unique:
+                return [item(ctx) for _ in range(count)]
+            result, seen = [], set()
+            for _ in range(count * 10):
+                value = item(ctx)
+                marker = json.dumps(value, sort_keys=True, default=str)
+                if marker not in seen:
+                    seen.add(marker)
+                    result.append(value)
+                    if len(result) == count:
+                        break
+            return result
+        return produce
+
+    def _compile_string(self, schema: Dict[str, Any]) -> Producer:
+        min_len = schema.get("minLength", 0)
+        max_len = schema.get("maxLength")
+        fits = (lambda value: min_len <= len(value) <= max_len) if max_len is not None else (lambda value: min_len <= len(value))
+
+        if "pattern" in schema:
+            try:
+                synthesizer = RegexSynthesizer(schema["pattern"])
+            except (ValueError, re.error) as e:
+                logger.warning("Pattern %r is not supported, generating a plain string: %s", schema["pattern"], e)
+            else:
+                def produce_pattern(ctx):
+                    value = synthesizer.generate(ctx)
+                    for _ in range(PATTERN_ATTEMPTS):
+                        if fits(value) and synthesizer.matches(value):
+                            break
+                        value = synthesizer.generate(ctx)
+                    return value
+                return produce_pattern
+
+        if max_len is None and min_len <= 1:
+            def plain(ctx):
+                return ctx.fake.text(max_nb_chars=TEXT_MAX_CHARS)
+        else:
+            high = max_len if max_len is not None else max(min_len, TEXT_MAX_CHARS)
+            low = min(max(min_len, 1), high)
+
+            def plain(ctx):
+                length = ctx.random.randint(low, high)
+                return ctx.fake.pystr(min_chars=length, max_chars=length)
+
+        fmt = _FORMATS.get(schema.get("format", ""))
+        if fmt is None:
+            return plain
+        if "minLength" not in schema and max_len is None:
+            return fmt
+
+        def produce_format(ctx):
+            for _ in range(PATTERN_ATTEMPTS):
+                value = fmt(ctx)
+                if fits(value):
+                    return value
+            # format - аннотация, minLength/maxLength - проверка: длина важнее
+            return plain(ctx)
+        return produce_format
+
+    @staticmethod
+    def _compile_number(schema: Dict[str, Any], integer: bool) -> Producer:
+        low, high = schema.get("minimum"), schema.get("maximum")
+        exclusive_low, exclusive_high = schema.get("exclusiveMinimum"), schema.get("exclusiveMaximum")
+        # OpenAPI 3.1: exclusive* - число, 3.0: флаг к minimum/maximum
+        if isinstance(exclusive_low, (int, float)) and not isinstance(exclusive_low, bool):
+            low, exclusive_low = exclusive_low, True
+        if isinstance(exclusive_high, (int, float)) and not isinstance(exclusive_high, bool):
+            high, exclusive_high = exclusive_high, True
+
+        default_low, default_high = INT_RANGE if integer else FLOAT_RANGE
+        if low is None:
+            low = min(default_low, high - (default_high - default_low)) if high is not None else default_low
+        if high is None:
+            high = max(default_high, low + (default_high - default_low))
+        multiple = schema.get("multipleOf")
+
+        if integer or multiple:
+            step = multiple or 1
+            first = math.ceil(low / step) + (1 if exclusive_low and low % step == 0 else 0)
+            last = math.floor(high / step) - (1 if exclusive_high and high % step == 0 else 0)
+            if last < first:
+                last = first
+            if integer:
+                return lambda ctx: int(ctx.random.randint(first, last) * step)
+            return lambda ctx: round(ctx.random.randint(first, last) * step, 10)
+
+        def produce(ctx):
+            value = ctx.random.uniform(low, high)
+            if (exclusive_low and value <= low) or (exclusive_high and value >= high):
+                value = (low + high) / 2
+            return value
+        return produce
+
+    def _minimal(self, schema: Dict[str, Any], seen: Tuple[str, ...] = ()) -> Producer:
+        """
+        Значение на границе глубины: только обязательные поля, обязательные ссылки
+        раскрываются так же минимально. Обязательный цикл ссылок конечного
+        валидного значения не имеет - в нём остаётся None.
+        """
+        if "$ref" in schema:
+            name = self._ref_name(schema["$ref"])
+            if name in seen:
+                return lambda ctx: None
+            return self._minimal(self.schemas[name], seen + (name,))
+        if "const" in schema or schema.get("enum"):
+            return self.compile(schema, self.max_depth)
+        if "allOf" in schema:
+            return self._minimal(self._merge_all_of(schema), seen)
+        for key in ("oneOf", "anyOf"):
+            if schema.get(key):
+                return self._minimal(schema[key][0], seen)
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            schema_type = next((t for t in schema_type if t != "null"), None)
+        if schema_type == "object" or "properties" in schema:
+            required = set(schema.get("required", []))
+            properties = [
+                (name, self._minimal(prop, seen))
+                for name, prop in schema.get("properties", {}).items()
+                if name in required and not prop.get("readOnly")
+            ]
+            return lambda ctx: {name: produce(ctx) for name, produce in properties}
+        if schema_type == "array" or "items" in schema:
+            min_items = schema.get("minItems", 0)
+            if not min_items:
+                return lambda ctx: []
+            item = self._minimal(schema.get("items", {}), seen)
+            return lambda ctx: [item(ctx) for _ in range(min_items)]
+        return self.compile(schema, self.max_depth)
@@ -0,0 +1,79 @@
+import os
+from contextlib import nullcontext
+
+import pytest
+
+from my_codegen.http_clients.metrics import default_registry
+from my_codegen.http_clients.trusted import trusted_responses
+from my_codegen.utils.logger import flush_reports
+from my_codegen.utils.report_utils import AttachmentSpool, ReportSettings
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("my-api-client")
+    group.addoption(
+        "--api-metrics-dir",
+        action="store",
+        default=os.getenv("API_METRICS_DIR"),
+        help="Каталог для выгрузки метрик запросов (JSON и Prometheus) в конце сессии",
+    )
+
+
+def pytest_configure(config):
+    # Отложенные вложения сбрасываются хуками ниже
+    ReportSettings.flush_managed = True
+    config.addinivalue_line(
+        "markers",
+        "trusted_responses(enabled=True): собирать модели ответов без валидации "
+        "(enabled=False - полная валидация, даже если включено API_TRUSTED_RESPONSES)",
+    )
+
+
+def _trusted_mode(item):
+    marker = item.get_closest_marker("trusted_responses")
+    if marker is None:
+        return nullcontext()
+    return trusted_responses(marker.kwargs.get("enabled", marker.args[0] if marker.args else True))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    metrics_dir = session.config.getoption("--api-metrics-dir")
+    if not metrics_dir or not default_registry.snapshot()["endpoints"]:
+        return
+    # Под pytest-xdist каждый воркер пишет свои файлы
+    worker_id = os.getenv("PYTEST_XDIST_WORKER")
+    default_registry.dump(metrics_dir, suffix=f"-{worker_id}" if worker_id else "")
+
+
+def pytest_unconfigure(config):
+    flush_reports()
+    ReportSettings.flush_managed = False
+    AttachmentSpool.cleanup()
+
+
+def _flush_attachments():
+    flush_reports()
+    AttachmentSpool.flush()
+
+
+# Отложенные вложения прикрепляются в конце каждой фазы теста,
+# пока отчёт теста ещё открыт
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    with _trusted_mode(item):
+        yield
+    _flush_attachments()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    with _trusted_mode(item):
+        yield
+    _flush_attachments()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    with _trusted_mode(item):
+        yield
+    _flush_attachments()
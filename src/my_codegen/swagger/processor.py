@@ -1,11 +1,23 @@
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set
 from http import HTTPStatus
 
-from my_codegen.codegen.data_models import Endpoint, Parameter
+from my_codegen.codegen.data_models import Endpoint, Pagination, Parameter
 
 
 class SwaggerProcessor:
+    # Имена параметров и полей для распознавания пагинации (сравнение без регистра и "_")
+    PAGE_PARAMS = ('page', 'pageNumber', 'pageNum', 'pageIndex')
+    SIZE_PARAMS = ('size', 'pageSize', 'perPage', 'limit')
+    OFFSET_PARAMS = ('offset', 'skip', 'start')
+    LIMIT_PARAMS = ('limit', 'take', 'size', 'count')
+    CURSOR_PARAMS = ('cursor', 'after', 'pageToken', 'continuationToken')
+    ITEMS_FIELDS = ('items', 'results', 'data', 'content', 'records', 'rows', 'list', 'values')
+    # "count" сюда не входит: часто это размер текущей страницы, а не всей выдачи
+    TOTAL_FIELDS = ('total', 'totalCount', 'totalElements', 'totalItems', 'totalRecords')
+    TOTAL_PAGES_FIELDS = ('totalPages', 'pageCount', 'pages')
+    NEXT_CURSOR_FIELDS = ('nextCursor', 'nextPageToken', 'continuationToken', 'cursor')
+
     def __init__(self, swagger: Dict[str, Any]):
         self.swagger = swagger
 
@@ -29,6 +41,7 @@ class SwaggerProcessor:
 
                     responses = details.get('responses', {})
                     expected_status, return_type = self._extract_response_info(responses)
+                    pagination = self._detect_pagination(http_method, parameters, responses)
 
                     endpoints.append(Endpoint(
                         tag=tag,
@@ -40,7 +53,8 @@ class SwaggerProcessor:
                         payload_type=payload_type,
                         expected_status=expected_status,
                         return_type=return_type,
-                        description=description
+                        description=description,
+                        pagination=pagination,
                     ))
         return endpoints
 
@@ -49,7 +63,179 @@ class SwaggerProcessor:
         schemas = components.get('schemas', {})
         return [self._remove_underscores(name) for name in schemas.keys()]
 
+    def extract_imports_by_tag(self, endpoints: Optional[List[Endpoint]] = None) -> Dict[str, List[str]]:
+        """
+        Для каждого тега - модели, на которые действительно ссылается его клиент:
+        типы payload, ответа, path/query-параметров и элементов пагинации,
+        включая вложенные (List[List[Item]], Dict[str, Item]).
+        Порядок - как в components/schemas.
+        """
+        known = self.extract_imports()
+        order = {name: index for index, name in enumerate(known)}
+        by_tag: Dict[str, Set[str]] = {}
+        for endpoint in endpoints if endpoints is not None else self.extract_endpoints():
+            types = [endpoint.payload_type, endpoint.return_type]
+            types += [param.type for param in endpoint.path_params + endpoint.query_params]
+            if endpoint.pagination is not None:
+                types.append(endpoint.pagination.item_type)
+            used = by_tag.setdefault(endpoint.tag, set())
+            for type_str in types:
+                if type_str:
+                    used.update(name for name in re.findall(r'[A-Za-z_]\w*', type_str) if name in order)
+        return {tag: sorted(names, key=order.__getitem__) for tag, names in by_tag.items()}
+
+    def analyze_model_usage(self) -> Dict[str, str]:
+        """
+        Для каждой схемы из components/schemas определяет, где она используется:
+        "input" - только в теле запроса/параметрах, "output" - только в ответах,
+        "both" - и там, и там. Учитываются вложенные ссылки ($ref в свойствах,
+        items, allOf/oneOf/anyOf, additionalProperties). Неиспользуемые схемы - "both".
+        """
+        schemas = self.swagger.get('components', {}).get('schemas', {})
+        inputs: Set[str] = set()
+        outputs: Set[str] = set()
+
+        for methods in self.swagger.get('paths', {}).values():
+            for details in methods.values():
+                if not isinstance(details, dict):
+                    continue
+                for param in details.get('parameters', []):
+                    self._collect_refs(param.get('schema', {}), schemas, inputs)
+                for media in details.get('requestBody', {}).get('content', {}).values():
+                    self._collect_refs(media.get('schema', {}), schemas, inputs)
+                for response in details.get('responses', {}).values():
+                    for media in response.get('content', {}).values():
+                        self._collect_refs(media.get('schema', {}), schemas, outputs)
+
+        usage = {}
+        for raw_name in schemas:
+            if raw_name in outputs and raw_name not in inputs:
+                role = 'output'
+            elif raw_name in inputs and raw_name not in outputs:
+                role = 'input'
+            else:
+                role = 'both'
+            usage[self._remove_underscores(raw_name)] = role
+        return usage
+
     # -- private helpers --
+    def _collect_refs(self, schema: Any, schemas: Dict[str, Any], found: Set[str]) -> None:
+        for ref in self._iter_refs(schema):
+            name = ref.split('/')[-1]
+            if name in found or name not in schemas:
+                continue
+            found.add(name)
+            self._collect_refs(schemas[name], schemas, found)
+
+    def _iter_refs(self, schema: Any) -> Iterator[str]:
+        if isinstance(schema, dict):
+            for key, value in schema.items():
+                if key == '$ref' and isinstance(value, str):
+                    yield value
+                else:
+                    yield from self._iter_refs(value)
+        elif isinstance(schema, list):
+            for item in schema:
+                yield from self._iter_refs(item)
+
+    def _detect_pagination(
+            self, http_method: str, parameters: List[Dict[str, Any]], responses: Dict[str, Any]
+    ) -> Optional[Pagination]:
+        """
+        Распознаёт постраничную выдачу GET-эндпоинта по query-параметрам
+        (page/size, offset/limit, cursor) и схеме ответа: список элементов -
+        сам ответ-массив или поле-массив объекта (items, results, ...),
+        плюс, если есть, общее количество и курсор следующей страницы.
+        """
+        if http_method.lower() != 'get':
+            return None
+        query = {p['name']: p for p in parameters if p.get('in') == 'query' and p.get('name')}
+        schema = self._success_schema(responses)
+        if not query or schema is None:
+            return None
+
+        schema = self._resolve_schema(schema)
+        properties: Dict[str, Any] = {}
+        if schema.get('type') == 'array':
+            items_field = None
+            item_schema = schema.get('items', {})
+        else:
+            properties = self._schema_properties(schema)
+            arrays = [name for name, prop in properties.items()
+                      if self._resolve_schema(prop).get('type') == 'array']
+            items_field = self._find_name(arrays, self.ITEMS_FIELDS) or (arrays[0] if len(arrays) == 1 else None)
+            if items_field is None:
+                return None
+            item_schema = self._resolve_schema(properties[items_field]).get('items', {})
+
+        numeric = [name for name, prop in properties.items()
+                   if self._resolve_schema(prop).get('type') in ('integer', 'number')]
+        strings = [name for name, prop in properties.items()
+                   if self._resolve_schema(prop).get('type') == 'string']
+        fields = dict(
+            item_type=self._map_openapi_type_to_python(item_schema),
+            items_field=items_field,
+            total_field=self._find_name(numeric, self.TOTAL_FIELDS),
+            total_pages_field=self._find_name(numeric, self.TOTAL_PAGES_FIELDS),
+        )
+
+        cursor_param = self._find_name(query, self.CURSOR_PARAMS)
+        next_cursor_field = self._find_name(strings, self.NEXT_CURSOR_FIELDS)
+        if cursor_param and next_cursor_field:
+            return Pagination(
+                style='cursor', page_param=cursor_param, size_param=self._find_name(query, self.SIZE_PARAMS),
+                next_cursor_field=next_cursor_field, **fields,
+            )
+        page_param = self._find_name(query, self.PAGE_PARAMS)
+        if page_param:
+            page_schema = query[page_param].get('schema', {})
+            # Первая страница - default параметра, без него - minimum
+            first_page = page_schema.get('default', page_schema.get('minimum', 1))
+            first_page = first_page if first_page in (0, 1) else 1
+            return Pagination(
+                style='page', page_param=page_param, size_param=self._find_name(query, self.SIZE_PARAMS),
+                first_page=first_page, **fields,
+            )
+        offset_param = self._find_name(query, self.OFFSET_PARAMS)
+        if offset_param:
+            return Pagination(
+                style='offset', page_param=offset_param, size_param=self._find_name(query, self.LIMIT_PARAMS),
+                first_page=0, **fields,
+            )
+        return None
+
+    @staticmethod
+    def _find_name(names: Iterable[str], candidates: Iterable[str]) -> Optional[str]:
+        normalized = {name.replace('_', '').replace('-', '').lower(): name for name in names}
+        for candidate in candidates:
+            name = normalized.get(candidate.lower())
+            if name is not None:
+                return name
+        return None
+
+    @staticmethod
+    def _success_schema(responses: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for status_code, response_obj in responses.items():
+            if status_code.startswith('2'):
+                media = response_obj.get('content', {}).get('application/json')
+                return media.get('schema') if media else None
+        return None
+
+    def _resolve_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        seen = set()
+        while '$ref' in schema and schema['$ref'] not in seen:
+            seen.add(schema['$ref'])
+            raw_name = schema['$ref'].split('/')[-1]
+            schema = self.swagger.get('components', {}).get('schemas', {}).get(raw_name, {})
+        return schema
+
+    def _schema_properties(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Свойства объекта с учётом allOf"""
+        properties = dict(schema.get('properties', {}))
+        for part in schema.get('allOf', []):
+            properties.update(self._schema_properties(self._resolve_schema(part)))
+        return properties
+
     @staticmethod
     def _remove_underscores(name: str) -> str:
         segments = name.split('_')
@@ -1,9 +1,49 @@
+import dataclasses
 import re
-from typing import Any, Union
+from contextlib import nullcontext
+from functools import wraps
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from datetime import datetime, date, timedelta
 
-from my_codegen.utils.report_utils import Reporter
+import allure
+from pydantic import BaseModel
+
+from my_codegen.utils.report_utils import Reporter, ReportSettings
 from my_codegen.utils.logger import logger
+from my_codegen.utils.structural_diff import hashable, structural_diff
+
+
+ItemKey = Union[None, str, Callable[[Any], Any]]
+MAX_REPORTED_ITEMS = 20
+
+
+def _item_key(item: Any, key: ItemKey) -> Any:
+    if key is None:
+        value = item
+    elif callable(key):
+        value = key(item)
+    elif isinstance(item, dict):
+        value = item.get(key)
+    elif _has_field(item, key):
+        value = getattr(item, key)
+    else:
+        # Скалярные ожидаемые значения (например, список id) сравниваются как есть:
+        # getattr('A', 'title') вернул бы метод str
+        value = item
+    return hashable(value)
+
+
+def _has_field(item: Any, key: str) -> bool:
+    """У объекта есть поле данных key (поле модели/Struct/dataclass или атрибут экземпляра)"""
+    if isinstance(item, BaseModel):
+        return key in type(item).model_fields
+    struct_fields = getattr(type(item), "__struct_fields__", None)
+    if struct_fields is not None:
+        return key in struct_fields
+    if dataclasses.is_dataclass(item):
+        return any(field.name == key for field in dataclasses.fields(item))
+    return key in getattr(item, "__dict__", ())
 
 
 class Expect:
@@ -18,11 +58,15 @@ class Expect:
         new_expect._negated = not self._negated
         return new_expect
 
-    def _fail(self, message: str, expected: Any = None):
+    def _fail(self, message: str, expected: Any = None, details: Optional[str] = None):
         negation = "NOT " if self._negated else ""
 
         full_message = f"{self._name} expected {negation}{message}"
 
+        if details is not None:
+            # Для больших значений вместо repr() показываем готовое описание отличий
+            raise AssertionError(f"{full_message}\n{details}")
+
         if expected is not None:
             full_message += f"\nExpected: {repr(expected)}"
 
@@ -34,17 +78,17 @@ class Expect:
         """Логирует успешную проверку"""
         success_message = f'"{self._name}" {message}'
 
-    def _check(self, condition: bool, message: str, expected: Any = None):
-        message_step = f"Check {self._name} {message}"
-
-        logger.info(f"{message_step}")
-        with Reporter.step(f"{message_step}"):
+    def _check(self, condition: bool, message: str, expected: Any = None, details: Optional[str] = None):
+        logger.info("Check %s %s", self._name, message)
+        # Имя шага собирается, только если шаги вообще пишутся в отчёт
+        step = Reporter.step(f"Check {self._name} {message}") if ReportSettings.steps_enabled() else nullcontext()
+        with step:
 
             if self._negated:
                 condition = not condition
 
             if not condition:
-                self._fail(message, expected)
+                self._fail(message, expected, details)
             else:
                 self._success(f"{message}")
 
@@ -68,6 +112,38 @@ class Expect:
             expected
         )
 
+    def isStructurallyEqual(
+            self,
+            expected: Any,
+            ignore_paths: Iterable[str] = (),
+            abs_tol: float = 0.0,
+            rel_tol: float = 0.0,
+            list_keys: Optional[Dict[str, Optional[str]]] = None,
+            max_diffs: int = 50,
+    ) -> 'Expect':
+        """
+        Структурное сравнение dict/list/pydantic-моделей с отчётом по путям.
+        ignore_paths - не сравниваемые пути ('items[*].updatedAt', '**.id'),
+        abs_tol/rel_tol - допуск для чисел, list_keys - списки, сравниваемые
+        без учёта порядка по ключу ({'items': 'id'}).
+        """
+        diffs = structural_diff(
+            self.actual,
+            expected,
+            ignore_paths=ignore_paths,
+            abs_tol=abs_tol,
+            rel_tol=rel_tol,
+            list_keys=list_keys,
+            max_diffs=max_diffs,
+        )
+        details = None
+        if diffs:
+            lines = [str(diff) for diff in diffs]
+            if len(diffs) >= max_diffs:
+                lines.append(f"... (stopped after {max_diffs} differences)")
+            details = "Differences:\n" + "\n".join(lines)
+        return self._check(not diffs, "to be structurally equal to expected", details=details)
+
     def isNone(self) -> 'Expect':
         return self._check(self.actual is None, "to be None")
 
@@ -140,9 +216,94 @@ class Expect:
             self._fail("to be iterable for item check")
 
     def containsItems(self, *items: Any) -> 'Expect':
-        for item in items:
-            self.containsItem(item)
-        return self
+        if isinstance(self.actual, str):
+            for item in items:
+                self.containsItem(item)
+            return self
+        index = self._collection_index()
+        item_keys = list(dict.fromkeys(_item_key(item, None) for item in items))
+        if self._negated:
+            # Как и поэлементный containsItem под _not(): ни одного из items быть не должно
+            present = [k for k in item_keys if k in index]
+            return self._check(
+                bool(present),
+                f"to contain any of {len(item_keys)} items",
+                details=self._collection_details([], present),
+            )
+        missing = [k for k in item_keys if k not in index]
+        return self._check(
+            not missing,
+            f"to contain all {len(item_keys)} items",
+            details=self._collection_details(missing, []),
+        )
+
+    # Проверки ниже строят хэш-индекс по actual один раз, поэтому работают
+    # за O(n + m). key - имя поля (для dict и моделей) или функция;
+    # скалярные элементы expected сравниваются с ключами как есть.
+
+    def _collection_index(self, key: ItemKey = None) -> Counter:
+        try:
+            return Counter(_item_key(item, key) for item in self.actual)
+        except TypeError:
+            self._fail("to be iterable for collection check")
+
+    @staticmethod
+    def _collection_details(missing: List[Any], unexpected: List[Any]) -> Optional[str]:
+        lines = []
+        for title, values in (("Missing", missing), ("Unexpected", unexpected)):
+            if values:
+                shown = ", ".join(repr(v) for v in values[:MAX_REPORTED_ITEMS])
+                more = f" ... and {len(values) - MAX_REPORTED_ITEMS} more" if len(values) > MAX_REPORTED_ITEMS else ""
+                lines.append(f"{title} ({len(values)}): {shown}{more}")
+        return "\n".join(lines) or None
+
+    def containsAll(self, expected: Iterable[Any], key: ItemKey = None) -> 'Expect':
+        """actual содержит все элементы expected (надмножество)"""
+        index = self._collection_index(key)
+        expected_keys = [_item_key(item, key) for item in expected]
+        missing = [k for k in dict.fromkeys(expected_keys) if k not in index]
+        return self._check(
+            not missing,
+            f"to contain all {len(expected_keys)} expected items",
+            details=self._collection_details(missing, []),
+        )
+
+    def isSubsetOf(self, expected: Iterable[Any], key: ItemKey = None) -> 'Expect':
+        """Все элементы actual есть в expected"""
+        index = self._collection_index(key)
+        expected_keys = {_item_key(item, key) for item in expected}
+        unexpected = [k for k in index if k not in expected_keys]
+        return self._check(
+            not unexpected,
+            f"to be a subset of {len(expected_keys)} expected items",
+            details=self._collection_details([], unexpected),
+        )
+
+    def hasSameItemsAs(self, expected: Iterable[Any], key: ItemKey = None) -> 'Expect':
+        """actual и expected совпадают как множества (без учёта порядка и повторов)"""
+        index = self._collection_index(key)
+        expected_keys = {_item_key(item, key) for item in expected}
+        missing = [k for k in expected_keys if k not in index]
+        unexpected = [k for k in index if k not in expected_keys]
+        return self._check(
+            not missing and not unexpected,
+            f"to have the same items as {len(expected_keys)} expected items",
+            details=self._collection_details(missing, unexpected),
+        )
+
+    def hasUniqueItems(self, key: ItemKey = None) -> 'Expect':
+        """Элементы actual (или их ключи) не повторяются"""
+        index = self._collection_index(key)
+        duplicates = [k for k, count in index.items() if count > 1]
+        details = None
+        if duplicates:
+            shown = ", ".join(repr(v) for v in duplicates[:MAX_REPORTED_ITEMS])
+            details = f"Duplicates ({len(duplicates)}): {shown}"
+        return self._check(
+            not duplicates,
+            "to have unique items" + (f" by {key}" if isinstance(key, str) else ""),
+            details=details,
+        )
 
     # ===============================
     #          ПРОВЕРКА ДАТЫ
@@ -248,9 +409,122 @@ class Expect:
         )
 
 
+# ===============================
+#       МЯГКИЕ ПРОВЕРКИ
+# ===============================
+
+class SoftExpect(Expect):
+    """
+    Expect для SoftAssertions: проверка не логируется, не открывает шаг
+    и не падает, а записывает результат в пакет.
+    """
+
+    def __init__(self, actual: Any, name: str, batch: 'SoftAssertions'):
+        super().__init__(actual, name)
+        self._batch = batch
+
+    def _not(self) -> 'SoftExpect':
+        new_expect = SoftExpect(self.actual, self._name, self._batch)
+        new_expect._negated = not self._negated
+        return new_expect
+
+    def _check(self, condition: bool, message: str, expected: Any = None, details: Optional[str] = None):
+        if self._negated:
+            condition = not condition
+
+        if condition:
+            self._batch._record(self._name, message, None)
+        else:
+            try:
+                self._fail(message, expected, details)
+            except AssertionError as e:
+                self._batch._record(self._name, message, str(e))
+        return self
+
+    def __getattribute__(self, item: str):
+        attr = super().__getattribute__(item)
+        if item.startswith("_") or not callable(attr):
+            return attr
+
+        # Проверки типов внутри методов вызывают _fail напрямую - перехватываем и их
+        @wraps(attr)
+        def soft_check(*args, **kwargs):
+            try:
+                return attr(*args, **kwargs)
+            except AssertionError as e:
+                self._batch._record(self._name, item, str(e))
+                return self
+
+        return soft_check
+
+
+class SoftAssertions:
+    """
+    Пакет мягких проверок: все проверки внутри with выполняются без отдельных
+    шагов отчёта, в конце открывается один шаг с таблицей результатов,
+    и если были ошибки - падает одно AssertionError со всеми ошибками.
+
+        with soft_assertions("Check user") as soft:
+            soft.expect(user.name, "name").isEqual("John")
+            soft.expect(user.age, "age").isGreaterThan(18)
+    """
+
+    max_reported_failures = 50
+
+    def __init__(self, name: str = "Soft assertions"):
+        self.name = name
+        self.results: List[Tuple[str, str, Optional[str]]] = []
+
+    def expect(self, actual: Any, name: str) -> SoftExpect:
+        return SoftExpect(actual, name, self)
+
+    def _record(self, name: str, message: str, error: Optional[str]) -> None:
+        self.results.append((name, message, error))
+
+    @property
+    def failures(self) -> List[Tuple[str, str, Optional[str]]]:
+        return [result for result in self.results if result[2] is not None]
+
+    def __enter__(self) -> 'SoftAssertions':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.report(raise_on_failure=exc_type is None)
+        return False
+
+    def _table(self) -> str:
+        width = max((len(name) for name, _, _ in self.results), default=5)
+        lines = [f"{'#':>4}  {'RESULT':6}  {'FIELD':{width}}  CHECK"]
+        for index, (name, message, error) in enumerate(self.results, start=1):
+            result = "PASS" if error is None else "FAIL"
+            lines.append(f"{index:>4}  {result:6}  {name:{width}}  {message}")
+        return "\n".join(lines)
+
+    def report(self, raise_on_failure: bool = True) -> None:
+        failures = self.failures
+        total = len(self.results)
+        summary = f"{self.name}: {total - len(failures)}/{total} checks passed"
+        logger.info("%s", summary)
+
+        if ReportSettings.steps_enabled():
+            with Reporter.step(summary):
+                allure.attach(self._table(), name=self.name, attachment_type=allure.attachment_type.TEXT)
+
+        if failures and raise_on_failure:
+            shown = failures[:self.max_reported_failures]
+            details = "\n\n".join(error for _, _, error in shown)
+            if len(failures) > len(shown):
+                details += f"\n\n... and {len(failures) - len(shown)} more failures"
+            raise AssertionError(f"{summary}\n\n{details}")
+
+
 # ===============================
 # ПРОСТОЙ API - ОДНА ФУНКЦИЯ
 # ===============================
 
 def expect(actual: Any, name: str) -> Expect:
     return Expect(actual, name)
+
+
+def soft_assertions(name: str = "Soft assertions") -> SoftAssertions:
+    return SoftAssertions(name)
@@ -0,0 +1,175 @@
+import warnings
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, List, Sequence, Union
+
+import numpy as np
+
+from my_codegen.utils.logger import logger
+from my_codegen.utils.report_utils import Reporter
+from my_codegen.utils.structural_diff import hashable
+
+MAX_SAMPLE_ROWS = 10
+
+_DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d.%m.%Y"]
+
+
+def _get_field(record: Any, path: Sequence[str]) -> Any:
+    value = record
+    for part in path:
+        if value is None:
+            return None
+        if isinstance(value, dict):
+            value = value.get(part)
+        else:
+            value = getattr(value, part, None)
+    return value
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _parse_date(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return _naive_utc(value)
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    if isinstance(value, str):
+        try:
+            return _naive_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            pass
+        for fmt in _DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+    raise ValueError(f"Cannot parse date: {value!r}")
+
+
+def _to_datetime64(values: List[Any]) -> np.ndarray:
+    # Быстрый путь: ISO-строки без смещения numpy разбирает сам,
+    # строки со смещением (numpy предупреждает о таймзоне) - разбираются по одной
+    if all(isinstance(v, str) for v in values):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                return np.array([v[:-1] if v.endswith("Z") else v for v in values], dtype="datetime64[us]")
+        except (ValueError, UserWarning):
+            pass
+    parsed = [_parse_date(v) for v in values]
+    return np.array(["NaT" if v is None else v for v in parsed], dtype="datetime64[us]")
+
+
+class ColumnExpect:
+    """
+    Проверки одного поля сразу для всех записей: значения собираются в колонку
+    NumPy, предикат вычисляется векторно, в отчёт попадает один шаг
+    с количеством и примерами упавших строк.
+    """
+
+    def __init__(self, records: Sequence[Any], name: str, field: str):
+        self.records = records
+        self._name = name
+        self.field = field
+        path = field.split(".")
+        self.values = [_get_field(record, path) for record in records]
+        self._numeric = None
+        self._dates = None
+
+    @property
+    def label(self) -> str:
+        return f"{self._name}[*].{self.field}"
+
+    def _numbers(self) -> np.ndarray:
+        if self._numeric is None:
+            self._numeric = np.array(
+                [np.nan if v is None or isinstance(v, bool) else v for v in self.values],
+                dtype=float,
+            )
+        return self._numeric
+
+    def _date_column(self) -> np.ndarray:
+        if self._dates is None:
+            self._dates = _to_datetime64(self.values)
+        return self._dates
+
+    def _check(self, passed: np.ndarray, message: str) -> 'ColumnExpect':
+        total = len(self.values)
+        failed_rows = np.flatnonzero(~passed)
+        message_step = f"Check {self.label} {message} ({total} records)"
+
+        logger.info("%s", message_step)
+        with Reporter.step(message_step):
+            if failed_rows.size:
+                sample = ", ".join(
+                    f"[{i}] {self.values[i]!r}" for i in failed_rows[:MAX_SAMPLE_ROWS].tolist()
+                )
+                more = " ..." if failed_rows.size > MAX_SAMPLE_ROWS else ""
+                raise AssertionError(
+                    f"{self.label} expected {message}\n"
+                    f"Failed {failed_rows.size} of {total} records\n"
+                    f"Sample: {sample}{more}"
+                )
+        return self
+
+    # -- общие --
+    def isNotNone(self) -> 'ColumnExpect':
+        passed = np.fromiter((v is not None for v in self.values), dtype=bool, count=len(self.values))
+        return self._check(passed, "to not be None")
+
+    def isEqual(self, expected: Any) -> 'ColumnExpect':
+        passed = np.fromiter((v == expected for v in self.values), dtype=bool, count=len(self.values))
+        return self._check(passed, f"to equal {expected!r}")
+
+    def isIn(self, allowed: Iterable[Any]) -> 'ColumnExpect':
+        allowed = list(allowed)
+        column = np.asarray(self.values)
+        allowed_array = np.asarray(allowed)
+        if column.dtype.kind in "iufU" and allowed_array.dtype.kind == column.dtype.kind:
+            passed = np.isin(column, allowed_array)
+        else:
+            # None, смешанные типы: сравнение через множество
+            allowed_set = {hashable(v) for v in allowed}
+            passed = np.fromiter(
+                (hashable(v) in allowed_set for v in self.values), dtype=bool, count=len(self.values)
+            )
+        return self._check(passed, f"to be one of {allowed!r}")
+
+    # -- числа --
+    def isGreaterThan(self, expected: Union[int, float]) -> 'ColumnExpect':
+        return self._check(self._numbers() > expected, f"to be greater than {expected}")
+
+    def isLessThan(self, expected: Union[int, float]) -> 'ColumnExpect':
+        return self._check(self._numbers() < expected, f"to be less than {expected}")
+
+    def isBetween(self, low: Union[int, float], high: Union[int, float]) -> 'ColumnExpect':
+        column = self._numbers()
+        return self._check((column >= low) & (column <= high), f"to be between {low} and {high}")
+
+    # -- даты --
+    def isAfter(self, date_threshold: Union[datetime, date, str]) -> 'ColumnExpect':
+        threshold = np.datetime64(_parse_date(date_threshold), "us")
+        return self._check(self._date_column() > threshold, f"to be after {threshold}")
+
+    def isBefore(self, date_threshold: Union[datetime, date, str]) -> 'ColumnExpect':
+        threshold = np.datetime64(_parse_date(date_threshold), "us")
+        return self._check(self._date_column() < threshold, f"to be before {threshold}")
+
+
+class ExpectAll:
+    def __init__(self, records: Iterable[Any], name: str):
+        self.records = records if isinstance(records, list) else list(records)
+        self._name = name
+
+    def field(self, field: str) -> ColumnExpect:
+        """Колонка по имени поля, вложенные поля - через точку: 'price.amount'"""
+        return ColumnExpect(self.records, self._name, field)
+
+
+def expect_all(records: Iterable[Any], name: str) -> ExpectAll:
+    return ExpectAll(records, name)
@@ -1,14 +1,23 @@
+import atexit
 import json
 import logging
+import queue
+import random
 import sys
+import threading
 import uuid
 from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 import allure
 import testit
 
 from http import HTTPStatus
 
+from my_codegen.utils.report_utils import ReportSettings
+from my_codegen.utils.thread_pool import SharedThreadPool
+
 
 class UUIDEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -19,60 +28,103 @@ class UUIDEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
-def configure_logging():
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
+STRUCTURED_FIELDS = ("service", "method", "path", "status", "latency")
+
 
-    ch = logging.StreamHandler(sys.stdout)
-    ch.setLevel(logging.INFO)
+class StructuredFormatter(logging.Formatter):
+    """Дописывает к сообщению структурные поля, переданные через extra"""
 
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    ch.setFormatter(formatter) 
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        fields = [
+            f"{name}={getattr(record, name)}"
+            for name in STRUCTURED_FIELDS
+            if getattr(record, name, None) is not None
+        ]
+        return f"{message} [{' '.join(fields)}]" if fields else message
 
-    logger.addHandler(ch)
 
+logger = logging.getLogger("my_codegen")
+logger.addHandler(logging.NullHandler())
 
-configure_logging()
-logger = logging.getLogger(__name__)
+_listener: Optional[QueueListener] = None
 
 
-def allure_report(response, payload):
+def configure_logging(level: int = logging.INFO, stream=None, structured: bool = False) -> QueueListener:
     """
-    Создает отчеты для Allure и Test IT одновременно
+    Включает вывод логов библиотеки: записи кладутся в очередь, а в поток
+    их пишет отдельный поток QueueListener, поэтому вызывающие потоки не ждут
+    блокировку обработчика. Корневой логгер не трогается.
     """
+    global _listener
+    stop_logging()
 
-    if payload is not None:
-        try:
-            if isinstance(payload, bytes):
-                payload = payload.decode('utf-8')
-
-            formatted_data = json.dumps(
-                json.loads(payload) if isinstance(payload, str) else payload,
-                indent=4,
-                ensure_ascii=False
-            )
-            html_request = f"<pre><code>{formatted_data}</code></pre>"
-            text_request = formatted_data
-        except (TypeError, UnicodeDecodeError, json.JSONDecodeError):
-            html_request = "<pre><code>Binary data cannot be serialized</code></pre>"
-            text_request = "Binary data cannot be serialized"
-    else:
-        html_request = "Data is None"
-        text_request = "Data is None"
+    handler = logging.StreamHandler(stream or sys.stdout)
+    formatter_cls = StructuredFormatter if structured else logging.Formatter
+    handler.setFormatter(formatter_cls('%(asctime)s - %(levelname)s - %(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    for old in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+        logger.removeHandler(old)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Дожидается записи накопленных логов и останавливает поток вывода"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def _format_request(payload) -> str:
+    if payload is None:
+        return "Data is None"
+    try:
+        if isinstance(payload, bytes):
+            payload = payload.decode('utf-8')
 
+        formatted_data = json.dumps(
+            json.loads(payload) if isinstance(payload, str) else payload,
+            indent=4,
+            ensure_ascii=False,
+            cls=UUIDEncoder
+        )
+        return f"<pre><code>{formatted_data}</code></pre>"
+    except (TypeError, UnicodeDecodeError, json.JSONDecodeError):
+        return "<pre><code>Binary data cannot be serialized</code></pre>"
+
+
+def _format_response(body: bytes, total_size: int) -> str:
+    text = body.decode('utf-8', errors='replace')
+    if len(body) < total_size:
+        # Обрезанный JSON не разобрать - показываем как есть
+        return f"<pre>{text}\n... (truncated, {total_size} bytes total)</pre>"
     try:
         formatted_response = json.dumps(
-            json.loads(response.text),
+            json.loads(text),
             indent=4,
             ensure_ascii=False
         )
-        html_response = f"<pre><code>{formatted_response}</code></pre>"
-        text_response = formatted_response
+        return f"<pre><code>{formatted_response}</code></pre>"
     except (ValueError, json.JSONDecodeError):
-        html_response = f"<pre>{response.text}</pre>"
-        text_response = response.text
+        return f"<pre>{text}</pre>"
+
+
+def _format_report(body: bytes, total_size: int, payload):
+    return _format_request(payload), _format_response(body, total_size)
+
 
-    # Отчет для Allure
+def _attach_report(html_request: str, html_response: str) -> None:
     allure.attach(
         html_request,
         name="Request",
@@ -85,6 +137,58 @@ def allure_report(response, payload):
     )
 
 
+_pending_reports = []
+_pending_lock = threading.Lock()
+
+
+def allure_report(response, payload):
+    """
+    Прикладывает запрос и ответ к отчёту Allure.
+
+    Включается ReportSettings.level="full" (API_REPORT_LEVEL=full).
+    В запросе сохраняются только сырые байты (не больше ReportSettings.max_body_bytes).
+    В отложенном режиме (под pytest-плагином) форматирование идёт в общем пуле
+    потоков, а вложения прикрепляются в flush_reports() в конце фазы теста;
+    очередь ограничена ReportSettings.max_pending: при переполнении поток теста
+    сбрасывает её сам, а вызовы из других потоков отбрасывают вложение.
+    """
+    if not ReportSettings.attachments_enabled():
+        return
+    if ReportSettings.sample_rate < 1.0 and random.random() >= ReportSettings.sample_rate:
+        return
+
+    content = response.content or b""
+    body = content[:ReportSettings.max_body_bytes]
+    if isinstance(payload, (bytes, str)) and len(payload) > ReportSettings.max_body_bytes:
+        payload = payload[:ReportSettings.max_body_bytes]
+
+    if not (ReportSettings.deferred and ReportSettings.flush_managed):
+        _attach_report(*_format_report(body, len(content), payload))
+        return
+
+    # Сбрасывать очередь (ждать пул и вызывать allure.attach) можно только в потоке теста:
+    # вызывающий сам может быть потоком пула (часть chunked upload, prefetch страницы)
+    on_test_thread = threading.current_thread() is threading.main_thread()
+    with _pending_lock:
+        if not on_test_thread and len(_pending_reports) >= ReportSettings.max_pending:
+            logger.debug("Report queue is full, dropping attachment for %s", response.url)
+            return
+        future = SharedThreadPool.get_executor().submit(_format_report, body, len(content), payload)
+        _pending_reports.append(future)
+        overflow = on_test_thread and len(_pending_reports) >= ReportSettings.max_pending
+    if overflow:
+        flush_reports()
+
+
+def flush_reports() -> None:
+    """Прикрепляет накопленные в отложенном режиме вложения к текущему тесту"""
+    with _pending_lock:
+        pending = list(_pending_reports)
+        _pending_reports.clear()
+    for future in pending:
+        _attach_report(*future.result())
+
+
 class ApiRequestError(AssertionError):
 
     def __init__(self, response, expected_status, method, payload=None):
@@ -1,10 +1,140 @@
+import itertools
+import shutil
+import threading
+
 import allure
 import testit
+from testit_python_commons.services import TmsPluginManager
+from contextlib import nullcontext
 from functools import wraps
 
 import tempfile
 import os
 
+from my_codegen.utils.thread_pool import SharedThreadPool
+
+
+class ReportSettings:
+    """
+    Настройки отчётности (по умолчанию из переменных окружения):
+    level - "steps" (только шаги, по умолчанию), "full" (шаги и вложения запросов) или "off";
+    deferred - форматировать вложения в фоне и прикреплять в конце фазы теста
+    (действует только когда сбросом управляет pytest-плагин, см. flush_managed);
+    sample_rate - доля запросов, для которых прикладываются запрос и ответ;
+    max_body_bytes - сколько байт тела запроса/ответа попадает во вложение;
+    max_pending - сколько отложенных вложений копится до принудительного сброса.
+    """
+    level = os.getenv("API_REPORT_LEVEL", "steps")
+    deferred = os.getenv("API_REPORT_DEFERRED", "1") == "1"
+    # Выставляет pytest-плагин: без него flush_reports() никто не вызывает
+    flush_managed = False
+    max_pending = int(os.getenv("API_REPORT_MAX_PENDING", "256"))
+    sample_rate = float(os.getenv("API_REPORT_SAMPLE_RATE", "1.0"))
+    max_body_bytes = int(os.getenv("API_REPORT_MAX_BODY_BYTES", str(256 * 1024)))
+
+    @classmethod
+    def steps_enabled(cls) -> bool:
+        return cls.level != "off"
+
+    @classmethod
+    def attachments_enabled(cls) -> bool:
+        return cls.level == "full" and cls.sample_rate > 0
+
+
+class AttachmentSpool:
+    """
+    Каталог-спул для вложений на всю сессию. Файл вложения пишется один раз
+    под исходным именем (при совпадении с ещё не выгруженным - с суффиксом -1, -2...):
+    Allure берёт его сразу, а в TestIT накопленные файлы загружаются в flush()
+    в конце фазы теста параллельно в SharedThreadPool и затем удаляются.
+    flush() вызывается в потоке теста и ждёт загрузки: вложения привязываются
+    к текущему тесту/шагу.
+    """
+    _directory = None
+    _pending = []
+    _lock = threading.Lock()
+
+    @classmethod
+    def directory(cls) -> str:
+        with cls._lock:
+            if cls._directory is None:
+                cls._directory = tempfile.mkdtemp(prefix="api-attachments-")
+            return cls._directory
+
+    @classmethod
+    def _create(cls, file_name: str):
+        """Создаёт файл со свободным именем в каталоге спула, возвращает (fd, путь)"""
+        stem, ext = os.path.splitext(file_name.replace(os.sep, "_"))
+        for n in itertools.count():
+            path = os.path.join(cls.directory(), f"{stem}-{n}{ext}" if n else stem + ext)
+            try:
+                return os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644), path
+            except FileExistsError:
+                continue
+
+    @classmethod
+    def write(cls, content, file_name: str) -> str:
+        fd, path = cls._create(file_name)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content.encode('utf-8') if isinstance(content, str) else content)
+        return path
+
+    @classmethod
+    def copy(cls, file_path: str) -> str:
+        """Копия файла в спуле: исходный файл можно менять или удалять до flush()"""
+        fd, path = cls._create(os.path.basename(file_path))
+        with os.fdopen(fd, 'wb') as dst, open(file_path, 'rb') as src:
+            shutil.copyfileobj(src, dst)
+        return path
+
+    @classmethod
+    def enqueue(cls, path: str, owned: bool) -> None:
+        with cls._lock:
+            cls._pending.append((path, owned))
+
+    @classmethod
+    def flush(cls) -> None:
+        with cls._lock:
+            pending = list(cls._pending)
+            cls._pending.clear()
+        if not pending:
+            return
+        try:
+            cls._upload([path for path, _ in pending])
+        finally:
+            for path, owned in pending:
+                if owned:
+                    cls._remove(path)
+
+    @staticmethod
+    def _upload(paths) -> None:
+        executor = SharedThreadPool.get_executor()
+        step = TmsPluginManager.get_step_manager().get_active_step()
+        if step:
+            # Список вложений шага дополняется не атомарно - привязываем в потоке теста
+            adapter_manager = TmsPluginManager.get_adapter_manager()
+            futures = [executor.submit(adapter_manager.load_attachments, [path]) for path in paths]
+            step.set_attachments(step.get_attachments() + [a for f in futures for a in f.result()])
+            return
+        hook = TmsPluginManager.get_plugin_manager().hook
+        if not hasattr(hook, 'add_attachments'):
+            return
+        for future in [executor.submit(hook.add_attachments, attach_paths=[path]) for path in paths]:
+            future.result()
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        if os.path.exists(path):
+            os.unlink(path)
+
+    @classmethod
+    def cleanup(cls) -> None:
+        with cls._lock:
+            directory, cls._directory = cls._directory, None
+            cls._pending.clear()
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+
 
 class Reporter:
     @staticmethod
@@ -73,7 +203,10 @@ class Reporter:
     @staticmethod
     def attach(file_path, name=None):
         allure.attach.file(file_path, name=name)
-        testit.addAttachments(file_path)
+        if ReportSettings.deferred and ReportSettings.flush_managed:
+            AttachmentSpool.enqueue(AttachmentSpool.copy(file_path), owned=True)
+        else:
+            testit.addAttachments(file_path)
 
     @staticmethod
     def message(message_text):
@@ -82,6 +215,8 @@ class Reporter:
 
     @staticmethod
     def step(name):
+        if not ReportSettings.steps_enabled():
+            return nullcontext()
         allure_step = allure.step(name)
         testit_step = testit.step(name)
 
@@ -152,11 +287,6 @@ class Reporter:
 
     @staticmethod
     def attach_bytes(content, name=None, attachment_type=None):
-        if attachment_type:
-            allure.attach(content, name=name, attachment_type=attachment_type)
-        else:
-            allure.attach(content, name=name)
-
         ext = ""
         if attachment_type == allure.attachment_type.PNG:
             ext = ".png"
@@ -168,13 +298,13 @@ class Reporter:
             ext = ".json"
 
         file_name = (name or "attachment").replace(" ", "_") + ext
-        temp_dir = tempfile.mkdtemp()
-        temp_file_path = os.path.join(temp_dir, file_name)
+        file_path = AttachmentSpool.write(content, file_name)
 
-        try:
-            with open(temp_file_path, 'wb') as f:
-                f.write(content)
-            testit.addAttachments(temp_file_path)
-        finally:
-            os.unlink(temp_file_path)
-            os.rmdir(temp_dir)
\ No newline at end of file
+        allure.attach.file(file_path, name=name, attachment_type=attachment_type)
+        if ReportSettings.deferred and ReportSettings.flush_managed:
+            AttachmentSpool.enqueue(file_path, owned=True)
+        else:
+            try:
+                testit.addAttachments(file_path)
+            finally:
+                AttachmentSpool._remove(file_path)
@@ -0,0 +1,283 @@
+import math
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+PathKey = Union[str, int]
+_TOKEN = re.compile(r"\[(\*\*|\*|\d+)\]|([^.\[\]]+)")
+_MISSING = object()
+
+
+@dataclass
+class Difference:
+    path: str
+    kind: str
+    actual: Any = None
+    expected: Any = None
+
+    def __str__(self) -> str:
+        if self.kind == "missing":
+            return f"{self.path}: missing (expected {_short_repr(self.expected)})"
+        if self.kind == "unexpected":
+            return f"{self.path}: unexpected {_short_repr(self.actual)}"
+        return f"{self.path}: {_short_repr(self.actual)} != {_short_repr(self.expected)}"
+
+
+def _short_repr(value: Any, limit: int = 80) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def format_path(path: Tuple[PathKey, ...]) -> str:
+    parts = ["$"]
+    for key in path:
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return "".join(parts)
+
+
+def _parse_pattern(pattern: str) -> Tuple[str, ...]:
+    """'items[*].id' -> ('items', '*', 'id'); '**' - любое количество уровней"""
+    pattern = pattern[1:] if pattern.startswith("$") else pattern
+    return tuple(index or name for index, name in _TOKEN.findall(pattern))
+
+
+class _PathMatcher:
+    """
+    Сопоставляет путь с набором шаблонов по мере спуска по дереву:
+    состояние узла - набор позиций в шаблонах, поэтому проверка ребёнка
+    стоит O(число активных шаблонов), а не O(длина пути).
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = [_parse_pattern(p) for p in patterns]
+
+    def initial(self) -> frozenset:
+        return self._closure((i, 0) for i in range(len(self.patterns)))
+
+    def _closure(self, states) -> frozenset:
+        result = set()
+        stack = list(states)
+        while stack:
+            index, pos = stack.pop()
+            if (index, pos) in result:
+                continue
+            result.add((index, pos))
+            pattern = self.patterns[index]
+            if pos < len(pattern) and pattern[pos] == "**":
+                stack.append((index, pos + 1))
+        return frozenset(result)
+
+    def advance(self, states: frozenset, key: PathKey) -> frozenset:
+        if not states:
+            return states
+        token = str(key)
+        nxt = []
+        for index, pos in states:
+            pattern = self.patterns[index]
+            if pos >= len(pattern):
+                continue
+            current = pattern[pos]
+            if current == "**":
+                nxt.append((index, pos))
+            elif current == "*" or current == token:
+                nxt.append((index, pos + 1))
+        return self._closure(nxt)
+
+    def matched(self, states: frozenset) -> Optional[int]:
+        for index, pos in states:
+            if pos == len(self.patterns[index]):
+                return index
+        return None
+
+
+class _StopDiff(Exception):
+    pass
+
+
+class StructuralDiff:
+    """
+    Структурное сравнение dict/list/pydantic-моделей.
+
+    ignore_paths - шаблоны путей, которые не сравниваются ('items[*].updatedAt', '**.id');
+    abs_tol/rel_tol - допуск для чисел;
+    list_keys - шаблон пути списка -> поле, по которому элементы сопоставляются
+    без учёта порядка (None - сравнение как мультимножеств значений).
+    Совпадающие поддеревья отсекаются одним сравнением == без обхода.
+    """
+
+    def __init__(
+            self,
+            ignore_paths: Iterable[str] = (),
+            abs_tol: float = 0.0,
+            rel_tol: float = 0.0,
+            list_keys: Optional[Dict[str, Optional[str]]] = None,
+            max_diffs: int = 100,
+    ):
+        self.ignore = _PathMatcher(ignore_paths)
+        self.list_key_patterns = list((list_keys or {}).items())
+        self.unordered = _PathMatcher(pattern for pattern, _ in self.list_key_patterns)
+        self.abs_tol = abs_tol
+        self.rel_tol = rel_tol
+        self.max_diffs = max_diffs
+
+    def compare(self, actual: Any, expected: Any) -> List[Difference]:
+        self._diffs: List[Difference] = []
+        try:
+            self._compare(
+                _to_plain(actual),
+                _to_plain(expected),
+                (),
+                self.ignore.initial(),
+                self.unordered.initial(),
+            )
+        except _StopDiff:
+            pass
+        return self._diffs
+
+    def _add(self, path, kind, actual=None, expected=None) -> None:
+        self._diffs.append(Difference(format_path(path), kind, actual, expected))
+        if len(self._diffs) >= self.max_diffs:
+            raise _StopDiff
+
+    def _compare(self, actual, expected, path, ignore_state, unordered_state) -> None:
+        if actual is expected:
+            return
+        if self.ignore.matched(ignore_state) is not None:
+            return
+        try:
+            if actual == expected:
+                return
+        except Exception:
+            pass
+
+        if isinstance(actual, dict) and isinstance(expected, dict):
+            for key, expected_value in expected.items():
+                actual_value = actual.get(key, _MISSING)
+                child_ignore = self.ignore.advance(ignore_state, key)
+                if actual_value is _MISSING:
+                    if self.ignore.matched(child_ignore) is None:
+                        self._add(path + (key,), "missing", expected=expected_value)
+                    continue
+                self._compare(
+                    actual_value, expected_value, path + (key,),
+                    child_ignore, self.unordered.advance(unordered_state, key),
+                )
+            for key in actual.keys() - expected.keys():
+                if self.ignore.matched(self.ignore.advance(ignore_state, key)) is None:
+                    self._add(path + (key,), "unexpected", actual=actual[key])
+            return
+
+        if isinstance(actual, list) and isinstance(expected, list):
+            matched = self.unordered.matched(unordered_state)
+            if matched is not None:
+                self._compare_unordered(
+                    actual, expected, path, ignore_state, unordered_state,
+                    self.list_key_patterns[matched][1],
+                )
+                return
+            for index in range(min(len(actual), len(expected))):
+                self._compare(
+                    actual[index], expected[index], path + (index,),
+                    self.ignore.advance(ignore_state, index),
+                    self.unordered.advance(unordered_state, index),
+                )
+            for index in range(len(expected), len(actual)):
+                self._add(path + (index,), "unexpected", actual=actual[index])
+            for index in range(len(actual), len(expected)):
+                self._add(path + (index,), "missing", expected=expected[index])
+            return
+
+        if self._numbers_close(actual, expected):
+            return
+        self._add(path, "changed", actual, expected)
+
+    def _compare_unordered(self, actual, expected, path, ignore_state, unordered_state, key) -> None:
+        def item_key(item, index):
+            if key is not None:
+                return hashable(item.get(key) if isinstance(item, dict) else item)
+            # Элементы сравниваются целиком - без полей из ignore_paths
+            return self._masked(item, self.ignore.advance(ignore_state, index))
+
+        actual_index: Dict[Any, Deque[int]] = {}
+        for index, item in enumerate(actual):
+            actual_index.setdefault(item_key(item, index), deque()).append(index)
+
+        used = set()
+        for index, item in enumerate(expected):
+            candidates = actual_index.get(item_key(item, index))
+            if not candidates:
+                self._add(path + (index,), "missing", expected=item)
+                continue
+            actual_pos = candidates.popleft()
+            used.add(actual_pos)
+            if key is not None:
+                self._compare(
+                    actual[actual_pos], item, path + (actual_pos,),
+                    self.ignore.advance(ignore_state, actual_pos),
+                    self.unordered.advance(unordered_state, actual_pos),
+                )
+        for index, item in enumerate(actual):
+            if index not in used:
+                self._add(path + (index,), "unexpected", actual=item)
+
+    def _masked(self, value: Any, ignore_state: frozenset) -> Any:
+        """hashable(value) без поддеревьев, попадающих под ignore_paths"""
+        if not ignore_state:
+            return hashable(value)
+        if self.ignore.matched(ignore_state) is not None:
+            return _MISSING
+        if isinstance(value, dict):
+            items = []
+            for k, v in value.items():
+                masked = self._masked(v, self.ignore.advance(ignore_state, k))
+                if masked is not _MISSING:
+                    items.append((str(k), masked))
+            return tuple(sorted(items))
+        if isinstance(value, list):
+            return tuple(self._masked(v, self.ignore.advance(ignore_state, i)) for i, v in enumerate(value))
+        return hashable(value)
+
+    def _numbers_close(self, actual, expected) -> bool:
+        if not (self.abs_tol or self.rel_tol):
+            return False
+        numeric = (int, float)
+        if isinstance(actual, bool) or isinstance(expected, bool):
+            return False
+        if isinstance(actual, numeric) and isinstance(expected, numeric):
+            return math.isclose(actual, expected, rel_tol=self.rel_tol, abs_tol=self.abs_tol)
+        return False
+
+
+def _to_plain(value: Any) -> Any:
+    """pydantic-модели на любом уровне (в т.ч. вперемешку с dict в списках) -> dict"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", warnings=False)
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    return value
+
+
+def hashable(value: Any) -> Any:
+    """Приводит значение (в т.ч. dict, list, pydantic-модель) к хэшируемому виду"""
+    if isinstance(value, BaseModel):
+        return hashable(value.model_dump(mode="json", warnings=False))
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), hashable(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(hashable(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(hashable(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def structural_diff(actual: Any, expected: Any, **options) -> List[Difference]:
+    return StructuralDiff(**options).compare(actual, expected)
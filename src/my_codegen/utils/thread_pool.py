@@ -0,0 +1,32 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+class SharedThreadPool:
+    """
+    Общий пул потоков для фоновых задач клиента (параллельные загрузки и т.п.).
+    Размер пула задаётся переменной окружения API_CLIENT_POOL_SIZE.
+    """
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+    max_workers = int(os.getenv("API_CLIENT_POOL_SIZE", "16"))
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=cls.max_workers,
+                        thread_name_prefix="api-client",
+                    )
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls, wait: bool = True) -> None:
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=wait)
+                cls._executor = None